@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from .search import ensure_search_index
+    ensure_search_index(connections[using])
 
 
 class OrganizerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'organizer'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # Reinstall the full-text triggers that SQLite table rebuilds drop
+        post_migrate.connect(_ensure_search_index, sender=self)
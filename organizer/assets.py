@@ -0,0 +1,196 @@
+"""Static asset pipeline: minify, hash, precompress and serve.
+
+collectstatic with CompressedManifestStaticFilesStorage minifies the app's
+own CSS/JS, writes content-hashed copies (ManifestStaticFilesStorage) and
+stores .gz and, when the brotli package is installed, .br variants next to
+them. StaticAssetMiddleware serves STATIC_ROOT from the app server, picking
+the smallest variant the client accepts; hashed names get far-future,
+immutable cache headers since their URL changes with their content.
+"""
+import gzip
+import mimetypes
+import os
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.http import FileResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.html')
+# Only bother with a variant that saves at least this much
+MIN_SAVING = 0.05
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Unhashed names may change in place, so they are only cached briefly
+MUTABLE_CACHE_CONTROL = 'public, max-age=60'
+
+_CSS_STRINGS = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/', re.S)
+
+
+def minify_css(source):
+    """Drop comments and insignificant whitespace; string literals are left alone."""
+    parts = _CSS_STRINGS.split(_CSS_COMMENTS.sub('', source))
+    for i in range(0, len(parts), 2):
+        code = re.sub(r'\s+', ' ', parts[i])
+        code = re.sub(r' ?([{};,>]) ?', r'\1', code)
+        code = re.sub(r': ', ':', code)
+        parts[i] = code.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_js(source):
+    """Strip indentation, blank lines and whole-line comments.
+
+    Line breaks are kept so automatic semicolon insertion behaves as before,
+    and lines inside multi-line template literals are copied untouched.
+    """
+    lines = []
+    in_template = False
+    for line in source.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        if len(re.findall(r'(?<!\\)`', line)) % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that minifies the app's assets and precompresses everything."""
+
+    # Third-party assets (e.g. the admin's) ship as their authors intended
+    minify_prefixes = ('organizer/', 'security_management/')
+
+    def _save(self, name, content):
+        minify = MINIFIERS.get(os.path.splitext(name)[1])
+        if minify and name.startswith(self.minify_prefixes) and '.min.' not in name:
+            content = ContentFile(minify(b''.join(content.chunks()).decode('utf-8')).encode('utf-8'))
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        written = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if processed and not isinstance(processed, Exception):
+                written.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(written):
+                self.compress(name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE):
+            return
+        with self.open(name) as f:
+            data = f.read()
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) <= len(data) * (1 - MIN_SAVING):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                super()._save(name + suffix, ContentFile(compressed))
+
+
+class StaticAsset:
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, path, immutable):
+        self.path = path
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.variants = [(coding, path + suffix) for coding, suffix in self.ENCODINGS
+                         if os.path.exists(path + suffix)]
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else MUTABLE_CACHE_CONTROL
+
+    def response(self, accept_encoding):
+        path, coding = self.path, None
+        for candidate, variant in self.variants:
+            if candidate in accept_encoding:
+                path, coding = variant, candidate
+                break
+        response = FileResponse(open(path, 'rb'), content_type=self.content_type)
+        if coding:
+            response['Content-Encoding'] = coding
+        if self.variants:
+            response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = self.cache_control
+        return response
+
+
+def accepted_encodings(header):
+    """Codings from an Accept-Encoding header, without the ones refused with q=0."""
+    codings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        if not re.fullmatch(r'\s*q=0(\.0*)?\s*', params):
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def scan_static_root(root):
+    """Map URL paths under STATIC_URL to StaticAsset for every collected file."""
+    hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    assets = {}
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if filename.endswith(('.gz', '.br')):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            assets[name] = StaticAsset(path, immutable=name in hashed)
+    return assets
+
+
+class StaticAssetMiddleware:
+    """Serve collected static files, precompressed, before the rest of the stack runs.
+
+    Enabled with STATIC_MANIFEST; the file list is read once at startup,
+    so restart workers after collectstatic. Sync and async capable, so under
+    ASGI it does not push the async views onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATIC_MANIFEST', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.prefix = settings.STATIC_URL
+        self.assets = scan_static_root(settings.STATIC_ROOT)
+
+    def serve(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            asset = self.assets.get(request.path[len(self.prefix):])
+            if asset is not None:
+                return asset.response(accepted_encodings(request.headers.get('Accept-Encoding', '')))
+        return None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.serve(request)
+        return self.get_response(request) if response is None else response
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        return await self.get_response(request) if response is None else response
@@ -0,0 +1,54 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Rendered fragments also go stale as tasks become overdue, so keep them short-lived
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+def _version_key(user_id):
+    return f'organizer:dashboard:version:{user_id}'
+
+
+def dashboard_version(user_id):
+    """Current cache version for a user's dashboard fragments.
+
+    Versions are nanosecond timestamps rather than counters, so an evicted
+    version key can never come back as a value that old fragments still use.
+    This also keeps bumps a plain set(), which the file-based backend handles.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+async def adashboard_version(user_id):
+    """Async dashboard_version() for async views."""
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_dashboard_version(user_id):
+    cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def invalidate_dashboard(user_id):
+    """Bump the user's dashboard version once the current transaction commits."""
+    transaction.on_commit(lambda: bump_dashboard_version(user_id))
+
+
+def dashboard_cache_key(user_id, name, *parts):
+    return ':'.join(['organizer:dashboard', str(user_id), str(dashboard_version(user_id)), name, *map(str, parts)])
+
+
+async def adashboard_cache_key(user_id, name, *parts):
+    version = await adashboard_version(user_id)
+    return ':'.join(['organizer:dashboard', str(user_id), str(version), name, *map(str, parts)])
@@ -4,7 +4,7 @@ from .models import Task
 class TaskForm(forms.ModelForm):
     class Meta:
         model = Task
-        fields = ['title', 'description', 'priority', 'status', 'category', 'due_date', 'recurrence']
+        fields = ['title', 'description', 'priority', 'status', 'category', 'due_date', 'reminder_time', 'recurrence']
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Enter task title'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': 'Enter task description'}),
@@ -12,5 +12,6 @@ class TaskForm(forms.ModelForm):
             'status': forms.Select(attrs={'class': 'form-control'}),
             'category': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., Work, Personal, Shopping'}),
             'due_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'reminder_time': forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
             'recurrence': forms.Select(attrs={'class': 'form-control'}),
         }
@@ -0,0 +1,125 @@
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from organizer.models import Task
+from taskorg.db_profiles import sqlite_database
+
+
+@contextmanager
+def default_database(config):
+    """Point the default alias at ``config``, so signals and helpers write there too."""
+    original = connections.settings[DEFAULT_DB_ALIAS]
+    connections[DEFAULT_DB_ALIAS].close()
+    del connections[DEFAULT_DB_ALIAS]
+    configured = connections.configure_settings({DEFAULT_DB_ALIAS: config})
+    connections.settings[DEFAULT_DB_ALIAS] = configured[DEFAULT_DB_ALIAS]
+    try:
+        yield
+    finally:
+        connections[DEFAULT_DB_ALIAS].close()
+        del connections[DEFAULT_DB_ALIAS]
+        connections.settings[DEFAULT_DB_ALIAS] = original
+
+
+class Command(BaseCommand):
+    help = ('Measure write throughput with concurrent writers for the database profiles: SQLite as '
+            'it was configured before (rollback journal, deferred transactions, a new connection per '
+            'request), SQLite with the tuned profile, and PostgreSQL when DATABASE_PROFILE=postgres.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent writer threads.')
+        parser.add_argument('--seconds', type=float, default=5, help='How long each profile runs.')
+
+    def handle(self, *args, **options):
+        scratch = Path(tempfile.mkdtemp())
+        legacy = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(scratch / 'legacy.sqlite3')}
+        profiles = {
+            'sqlite-legacy': legacy,
+            'sqlite-tuned': sqlite_database(str(scratch / 'tuned.sqlite3')),
+        }
+        try:
+            # One migrated file, copied for each SQLite profile
+            with default_database(legacy):
+                call_command('migrate', verbosity=0)
+            shutil.copy(legacy['NAME'], profiles['sqlite-tuned']['NAME'])
+
+            results = {}
+            for name, config in profiles.items():
+                with default_database(config):
+                    results[name] = self._run(config, options['workers'], options['seconds'])
+            if settings.DATABASES[DEFAULT_DB_ALIAS]['ENGINE'].endswith('postgresql'):
+                setup_test_environment()
+                old_config = setup_databases(verbosity=0, interactive=False)
+                try:
+                    results['postgres'] = self._run(
+                        settings.DATABASES[DEFAULT_DB_ALIAS], options['workers'], options['seconds'])
+                finally:
+                    teardown_databases(old_config, verbosity=0)
+                    teardown_test_environment()
+        finally:
+            connections.close_all()
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        self.stdout.write(f"{'profile':<16}{'writes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+        for name, result in results.items():
+            self.stdout.write(f"{name:<16}{result['writes_per_second']:>10.0f}{result['p50_ms']:>9.1f}"
+                              f"{result['p95_ms']:>9.1f}{result['errors']:>8}")
+
+    def _run(self, config, workers, seconds):
+        user, _ = User.objects.get_or_create(username='writer')
+        # Without persistent connections every request opens its own
+        reconnect = not config.get('CONN_MAX_AGE')
+        deadline = time.perf_counter() + seconds
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def writer(worker):
+            mine, failed = [], 0
+            n = 0
+            while time.perf_counter() < deadline:
+                n += 1
+                started = time.perf_counter()
+                try:
+                    # Create a task and then change it in one transaction, as the task views do
+                    with transaction.atomic():
+                        task = Task.objects.create(user=user, title=f'Task {worker}-{n}')
+                        task.status = 'In Progress'
+                        task.save(update_fields=['status'])
+                except DatabaseError:
+                    failed += 1
+                else:
+                    mine.append((time.perf_counter() - started) * 1000)
+                if reconnect:
+                    connections[DEFAULT_DB_ALIAS].close()
+            connections[DEFAULT_DB_ALIAS].close()
+            with lock:
+                latencies.extend(mine)
+                errors.append(failed)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else (latencies or [0]) * 19
+        return {
+            'writes_per_second': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) if latencies else 0,
+            'p95_ms': quantiles[18],
+            'errors': sum(errors),
+        }
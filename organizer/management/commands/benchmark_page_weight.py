@@ -0,0 +1,72 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+
+from organizer.assets import MINIFIERS, brotli
+from organizer.models import Task
+
+STATIC_REF = re.compile(r'(?:href|src)="([^"]+)"')
+
+
+def transfer_size(path):
+    """Bytes sent for a static file once minified and compressed as collectstatic would."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    minify = MINIFIERS.get('.' + path.rsplit('.', 1)[-1])
+    if minify:
+        data = minify(data.decode('utf-8')).encode('utf-8')
+    sizes = [len(data), len(gzip.compress(data, compresslevel=9))]
+    if brotli is not None:
+        sizes.append(len(brotli.compress(data, quality=11)))
+    return min(sizes)
+
+
+class Command(BaseCommand):
+    help = ('Render the main pages and report bytes per page view with the page styles and scripts '
+            'inlined (as before) against hashed, minified, compressed bundles, first and repeat view.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=20, help='Tasks seeded for the benchmark user.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = User.objects.create_user('weigh', 'weigh@example.com', 'bench-pass-123')
+            Task.objects.bulk_create([Task(user=user, title=f'Task {i}') for i in range(options['tasks'])])
+            client = Client()
+            client.force_login(user)
+            pages = {
+                'dashboard': reverse('organizer_dashboard'),
+                'today_view': reverse('today_view'),
+                'vault_view': reverse('vault_list'),
+                'task_create': reverse('task_create'),
+            }
+            rows = [(name, self._weigh(client.get(url).content)) for name, url in pages.items()]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'page':<14}{'inline':>10}{'first view':>12}{'repeat view':>13}")
+        for name, (inline, first, repeat) in rows:
+            self.stdout.write(f'{name:<14}{inline:>10,}{first:>12,}{repeat:>13,}')
+        self.stdout.write('Bytes per view; assets are cached by the browser after the first view.')
+
+    def _weigh(self, html):
+        raw = assets = 0
+        for url in STATIC_REF.findall(html.decode('utf-8')):
+            if not url.startswith(settings.STATIC_URL):
+                continue
+            path = finders.find(url[len(settings.STATIC_URL):])
+            if path:
+                with open(path, 'rb') as f:
+                    raw += len(f.read())
+                assets += transfer_size(path)
+        return len(html) + raw, len(html) + assets, len(html)
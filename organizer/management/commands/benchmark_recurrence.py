@@ -0,0 +1,67 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+
+from organizer.models import Task
+from organizer.recurrence import next_due_dates, spawn_next_occurrences
+
+
+class Command(BaseCommand):
+    help = 'Time next-occurrence computation and spawning for a large batch of recurring tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100_000, help='Number of recurring tasks.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Tasks spawned per spawn_next_occurrences() call.')
+        parser.add_argument('--materialize', action='store_true',
+                            help='Also insert the tasks and spawn their next occurrences '
+                                 '(in a throwaway test database).')
+
+    def handle(self, *args, **options):
+        count = options['tasks']
+        rng = random.Random(42)
+        now = timezone.now()
+        tasks = [
+            Task(
+                pk=i + 1,
+                user_id=0,
+                title=f'Recurring {i}',
+                recurrence=rng.choice(['daily', 'weekly', 'monthly']),
+                due_date=now + timedelta(days=rng.randint(-60, 60), minutes=rng.randint(0, 1439)),
+            )
+            for i in range(count)
+        ]
+
+        started = time.perf_counter()
+        next_due_dates(tasks)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'next_due_dates: {count} tasks in {elapsed:.3f}s '
+                          f'({count / elapsed:,.0f} tasks/s)')
+
+        if options['materialize']:
+            self._materialize(tasks, options['batch_size'])
+
+    def _materialize(self, tasks, batch_size):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = User.objects.create_user('bench-recurrence')
+            for task in tasks:
+                task.pk = None
+                task.user_id = user.pk
+            Task.objects.bulk_create(tasks, batch_size=batch_size)
+
+            started = time.perf_counter()
+            for i in range(0, len(tasks), batch_size):
+                spawn_next_occurrences(tasks[i:i + batch_size])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'spawn_next_occurrences: {len(tasks)} tasks in {elapsed:.3f}s '
+                              f'({len(tasks) / elapsed:,.0f} tasks/s)')
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
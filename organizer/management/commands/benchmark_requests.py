@@ -0,0 +1,197 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from organizer.models import Subtask, Task
+
+BENCH_PASSWORD = 'bench-pass-123'
+SEED_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database and measure p50/p95 latency, query count and peak '
+            'memory of the main endpoints and the login flow. Results are written as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10_000, help='Total tasks seeded (1k to 1M).')
+        parser.add_argument('--users', type=int, default=10, help='Users the tasks are spread across.')
+        parser.add_argument('--subtasks', type=int, default=2, help='Subtasks per task.')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint.')
+        parser.add_argument('--cold', action='store_true',
+                            help='Clear the cache before every request to measure uncached renders.')
+        parser.add_argument('--output', default='benchmark-results.json', help='Where to write the JSON results.')
+        parser.add_argument('--baseline', help='Earlier results file to print deltas against.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['tasks'] < options['users']:
+            raise CommandError('Need at least one user and one task per user.')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        # Everything runs against a test database, never the configured one
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = time.perf_counter()
+            user = self._seed(options['tasks'], options['users'], options['subtasks'])
+            self.stdout.write(f"Seeded {options['tasks']:,} tasks in {time.perf_counter() - started:.1f}s")
+            # The login flow is timed far more often than the attempt limits allow
+            with override_settings(RATELIMIT_ENABLED=False):
+                endpoints = self._run(user, options['requests'], options['cold'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        results = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'tasks': options['tasks'],
+                'users': options['users'],
+                'subtasks_per_task': options['subtasks'],
+                'requests': options['requests'],
+                'cold_cache': options['cold'],
+            },
+            'endpoints': endpoints,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+
+        self._report(endpoints, baseline['endpoints'] if baseline else {})
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def _seed(self, task_count, user_count, subtasks_per_task):
+        rng = random.Random(42)
+        now = timezone.now()
+        password = make_password(BENCH_PASSWORD)
+        users = User.objects.bulk_create([
+            User(username=f'bench{i}', email=f'bench{i}@example.com', password=password)
+            for i in range(user_count)
+        ])
+
+        for offset in range(0, task_count, SEED_BATCH_SIZE):
+            tasks = []
+            for i in range(offset, min(offset + SEED_BATCH_SIZE, task_count)):
+                completed = rng.random() < 0.4
+                tasks.append(Task(
+                    user=users[i % user_count],
+                    title=f'Task {i}',
+                    description=f'Synthetic task number {i}',
+                    priority=rng.choice(['Low', 'Medium', 'High']),
+                    status='Completed' if completed else rng.choice(['Pending', 'In Progress']),
+                    completed_at=now - timedelta(days=rng.randint(0, 13)) if completed else None,
+                    due_date=now + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.8 else None,
+                    is_archived=rng.random() < 0.1,
+                    subtask_total=subtasks_per_task,
+                    subtask_completed=subtasks_per_task if completed else 0,
+                ))
+            Task.objects.bulk_create(tasks)
+            Subtask.objects.bulk_create([
+                Subtask(task=task, title=f'Step {n}', is_completed=task.status == 'Completed')
+                for task in tasks
+                for n in range(subtasks_per_task)
+            ])
+        return users[0]
+
+    def _endpoints(self, user):
+        task = Task.objects.filter(user=user, is_archived=False).order_by('-created_at').first()
+
+        def get(client, url):
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response
+
+        def update_task(client):
+            return client.post(reverse('task_update', args=[task.pk]), {
+                'title': task.title,
+                'description': task.description,
+                'priority': task.priority,
+                'status': 'In Progress',
+                'category': 'Bench',
+                'recurrence': 'none',
+                'subtasks[]': ['Step 0', 'Step 1'],
+            })
+
+        def login(client):
+            client.logout()
+            response = client.post(reverse('login'), {'username_or_email': user.email, 'password': BENCH_PASSWORD})
+            # A rejected login also redirects, so check the session rather than the status
+            if '_auth_user_id' not in client.session:
+                raise CommandError('login did not sign the benchmark user in')
+            return response
+
+        return {
+            'dashboard': (lambda client: get(client, reverse('organizer_dashboard')), 200),
+            'today_view': (lambda client: get(client, reverse('today_view')), 200),
+            'vault_view': (lambda client: get(client, reverse('vault_list')), 200),
+            'export_tasks_csv': (lambda client: get(client, reverse('export_csv') + '?archived=all'), 200),
+            'task_update': (update_task, 302),
+            'login': (login, 302),
+        }
+
+    def _run(self, user, requests, cold):
+        client = Client()
+        results = {}
+        for name, (call, expected_status) in self._endpoints(user).items():
+            client.force_login(user)
+            latencies = []
+            for _ in range(requests):
+                if cold:
+                    cache.clear()
+                started = time.perf_counter()
+                response = call(client)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != expected_status:
+                    raise CommandError(f'{name} returned {response.status_code}, expected {expected_status}')
+
+            # Query count and memory are measured on a separate request so
+            # tracing overhead does not skew the latencies above
+            client.force_login(user)
+            if cold:
+                cache.clear()
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as queries:
+                call(client)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+            results[name] = {
+                'p50_ms': round(statistics.median(latencies), 3),
+                'p95_ms': round(quantiles[18], 3),
+                'queries': len(queries),
+                'peak_memory_kb': round(peak / 1024, 1),
+            }
+        return results
+
+    def _report(self, endpoints, baseline):
+        self.stdout.write(f"{'endpoint':<18}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'peak KB':>11}")
+        for name, result in endpoints.items():
+            line = (f"{name:<18}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                    f"{result['queries']:>9}{result['peak_memory_kb']:>11.0f}")
+            previous = baseline.get(name)
+            if previous and previous['p95_ms']:
+                change = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+                line += f"   p95 {change:+.0f}%, queries {result['queries'] - previous['queries']:+d}"
+            self.stdout.write(line)
@@ -0,0 +1,144 @@
+import http.client
+import shutil
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+
+from organizer.models import Task
+
+DEFAULT_PATHS = ['/organizer/', '/organizer/today/', '/organizer/vault/', '/organizer/export/csv/']
+
+SERVERS = {
+    'wsgi': lambda port, workers: [
+        'gunicorn', 'taskorg.wsgi:application', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+    ],
+    'asgi': lambda port, workers: [
+        'uvicorn', 'taskorg.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+        '--workers', str(workers), '--no-access-log',
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = ('Load-test the organizer read views under gunicorn (WSGI) and uvicorn (ASGI) '
+            'and compare requests per second.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='URL paths to request.')
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks seeded for the benchmark user.')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client connections.')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds of load per server.')
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        for server in options['servers']:
+            if not shutil.which(SERVERS[server](0, 1)[0]):
+                raise CommandError(f'{SERVERS[server](0, 1)[0]} is not installed; pip install gunicorn uvicorn')
+
+        user = self._seed(options['tasks'])
+        try:
+            cookie = self._session_cookie(user)
+            for server in options['servers']:
+                process = subprocess.Popen(
+                    SERVERS[server](options['port'], options['workers']),
+                    cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                try:
+                    self._wait_for_port(options['port'])
+                    result = self._load(options['port'], options['paths'], cookie,
+                                        options['concurrency'], options['duration'])
+                finally:
+                    process.terminate()
+                    process.wait()
+                self.stdout.write(
+                    f"{server}: {result['requests'] / options['duration']:,.0f} req/s, "
+                    f"p50 {result['p50']:.1f}ms, p95 {result['p95']:.1f}ms, {result['errors']} error(s)"
+                )
+        finally:
+            user.delete()
+
+    def _seed(self, count):
+        user = User.objects.create_user(f'bench-servers-{time.time_ns()}')
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                user=user,
+                title=f'Task {i}',
+                status='Completed' if i % 3 == 0 else 'Pending',
+                completed_at=now - timedelta(days=i % 7) if i % 3 == 0 else None,
+                due_date=now + timedelta(days=i % 30 - 15),
+                is_archived=i % 10 == 0,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        return user
+
+    def _session_cookie(self, user):
+        client = Client()
+        client.force_login(user)
+        return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    def _wait_for_port(self, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start listening on port {port}')
+
+    def _load(self, port, paths, cookie, concurrency, duration):
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def worker(offset):
+            nonlocal errors
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            i = offset
+            while time.monotonic() < deadline:
+                path = paths[i % len(paths)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers={'Cookie': cookie})
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    ok = False
+                    connection.close()
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors += 1
+            connection.close()
+
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+
+        if not latencies:
+            return {'requests': 0, 'p50': 0, 'p95': 0, 'errors': errors}
+        quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+        return {
+            'requests': len(latencies),
+            'p50': statistics.median(latencies),
+            'p95': quantiles[18],
+            'errors': errors,
+        }
@@ -0,0 +1,142 @@
+import json
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from organizer.models import Task
+from organizer.stats import get_user_stats
+from organizer.views import _weekly_chart
+
+SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def template_backend(cached):
+    """The project's template configuration with or without the cached loader."""
+    config = settings.TEMPLATES[0]
+    loaders = [('django.template.loaders.cached.Loader', SOURCE_LOADERS)] if cached else SOURCE_LOADERS
+    return DjangoTemplates({
+        'NAME': 'cached' if cached else 'uncached',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {**config['OPTIONS'], 'loaders': loaders},
+    })
+
+
+class Command(BaseCommand):
+    help = ('Render dashboard.html and today.html with many tasks through the cached and the '
+            'uncached template loaders and report p50/p95 render time. With --baseline, fails when '
+            'a p95 regresses by more than --tolerance percent.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks rendered per page.')
+        parser.add_argument('--renders', type=int, default=30, help='Timed renders per case.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='Earlier results file to compare against.')
+        parser.add_argument('--tolerance', type=float, default=20, help='Allowed p95 regression, in percent.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            request, contexts = self._prepare(options['tasks'])
+            results = {}
+            for cached in (True, False):
+                backend = template_backend(cached)
+                for page, render in self._pages(backend, request, contexts).items():
+                    results[f"{page}[{backend.name}]"] = self._time(render, options['renders'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'tasks': options['tasks'], 'results': results}, f, indent=2)
+        self._report(results, baseline['results'] if baseline else {}, options['tolerance'])
+
+    def _prepare(self, task_count):
+        user = User.objects.create_user('render', 'render@example.com', 'bench-pass-123')
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(user=user, title=f'Task {i}', description=f'Synthetic task number {i}',
+                 priority=('Low', 'Medium', 'High')[i % 3], category='Bench',
+                 due_date=now + timezone.timedelta(days=i % 30 - 10))
+            for i in range(task_count)
+        ])
+        tasks = list(Task.objects.filter(user=user).order_by('-created_at', '-pk'))
+
+        request = RequestFactory().get(reverse('organizer_dashboard'))
+        request.user = user
+        request.session = SessionStore()
+        chart_data = async_to_sync(_weekly_chart)(user, timezone.localdate())
+        dashboard = {
+            'task_count': len(tasks),
+            'next_cursor': None,
+            'view': 'all',
+            'greeting': 'Welcome back',
+            'chart_data': chart_data,
+            'weekly_total': sum(d['count'] for d in chart_data),
+            'stats': get_user_stats(user.pk),
+        }
+        return request, {'tasks': tasks, 'dashboard': dashboard}
+
+    def _pages(self, backend, request, contexts):
+        tasks = contexts['tasks']
+
+        def dashboard():
+            # As the view does on a cache miss: the task stack, then the page around it
+            stack = backend.get_template('organizer/organisms/task_stack.html').render({'tasks': tasks}, request)
+            context = {**contexts['dashboard'], 'task_stack': mark_safe(stack)}
+            return backend.get_template('organizer/dashboard.html').render(context, request)
+
+        def today():
+            return backend.get_template('organizer/today.html').render({'tasks': tasks, 'next_cursor': None}, request)
+
+        return {'dashboard.html': dashboard, 'today.html': today}
+
+    def _time(self, render, renders):
+        size = len(render())  # first render compiles, and is not timed
+        timings = []
+        for _ in range(renders):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        quantiles = statistics.quantiles(timings, n=20) if len(timings) > 1 else timings * 19
+        return {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(quantiles[18], 3),
+            'html_kb': round(size / 1024, 1),
+        }
+
+    def _report(self, results, baseline, tolerance):
+        self.stdout.write(f"{'case':<28}{'p50 ms':>10}{'p95 ms':>10}{'HTML KB':>10}")
+        regressions = []
+        for name, result in results.items():
+            line = f"{name:<28}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['html_kb']:>10.0f}"
+            previous = baseline.get(name)
+            if previous and previous['p95_ms']:
+                change = (result['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+                line += f'   p95 {change:+.0f}%'
+                if change > tolerance:
+                    regressions.append(name)
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"Render time regressed beyond {tolerance:.0f}%: {', '.join(regressions)}")
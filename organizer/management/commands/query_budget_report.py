@@ -0,0 +1,51 @@
+import json
+import sys
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Print the per-view query budget as a table. The samples live in the server process, '
+            'so read them from the staff JSON endpoint or from a saved copy of its output.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='URL of /organizer/debug/queries/, a JSON file, or - for stdin.')
+        parser.add_argument('--cookie', default='', help='Cookie header for a staff session when SOURCE is a URL.')
+        parser.add_argument('--max-queries', type=int, default=20, help='Flag views averaging more queries.')
+        parser.add_argument('--sort', choices=['queries', 'sql', 'total', 'duplicates'], default='queries')
+
+    def handle(self, *args, **options):
+        views = self._load(options['source'], options['cookie']).get('views', {})
+        if not views:
+            self.stdout.write('No requests recorded yet.')
+            return
+
+        sort_key = {
+            'queries': 'queries_avg', 'sql': 'sql_ms_avg', 'total': 'total_ms_p95', 'duplicates': 'duplicates_avg',
+        }[options['sort']]
+        self.stdout.write(f"{'view':<32}{'reqs':>6}{'queries':>9}{'max':>5}{'dups':>6}"
+                          f"{'sql ms':>9}{'render ms':>11}{'p95 ms':>9}")
+        for name, stats in sorted(views.items(), key=lambda item: item[1][sort_key], reverse=True):
+            line = (f"{name:<32}{stats['requests']:>6}{stats['queries_avg']:>9.1f}{stats['queries_max']:>5}"
+                    f"{stats['duplicates_avg']:>6.1f}{stats['sql_ms_avg']:>9.2f}{stats['render_ms_avg']:>11.2f}"
+                    f"{stats['total_ms_p95']:>9.2f}")
+            if stats['queries_avg'] > options['max_queries']:
+                line = self.style.ERROR(line + '  over budget')
+            self.stdout.write(line)
+            if stats['most_repeated_sql']:
+                repeated = stats['most_repeated_sql']
+                self.stdout.write(f"    repeated x{repeated['count']}: {repeated['sql'][:120]}")
+
+    def _load(self, source, cookie):
+        try:
+            if source == '-':
+                return json.load(sys.stdin)
+            if source.startswith(('http://', 'https://')):
+                request = urllib.request.Request(source, headers={'Cookie': cookie} if cookie else {})
+                with urllib.request.urlopen(request) as response:
+                    return json.load(response)
+            with open(source) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read query budget data from {source}: {e}')
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from organizer.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized subtask_total/subtask_completed counters on Task.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of tasks updated per UPDATE statement.')
+        parser.add_argument('--user', help='Only rebuild counters for this username.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        tasks = Task.objects.order_by('pk')
+        if options['user']:
+            tasks = tasks.filter(user__username=options['user'])
+
+        # Walk the primary key range in batches so each UPDATE holds its lock briefly
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(tasks.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            updated += Task.objects.filter(pk__in=pks).refresh_subtask_counts()
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt subtask counters for {updated} task(s).'))
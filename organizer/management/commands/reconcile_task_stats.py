@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from organizer.models import UserTaskStats
+from organizer.stats import COUNTERS, rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = ('Recount every UserTaskStats row from the tasks and report rows that had drifted. '
+            'Meant to run periodically, e.g. from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Users recounted per batch.')
+        parser.add_argument('--user', help='Only reconcile this username.')
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        rebuilt = drifted = 0
+        last_pk = 0
+        while True:
+            user_ids = list(users.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['batch_size']])
+            if not user_ids:
+                break
+            before = {
+                row[0]: row[1:]
+                for row in UserTaskStats.objects.filter(user_id__in=user_ids).values_list('user_id', *COUNTERS)
+            }
+            for stats in rebuild_user_stats(user_ids):
+                if stats.user_id in before and before[stats.user_id] != tuple(getattr(stats, f) for f in COUNTERS):
+                    drifted += 1
+            rebuilt += len(user_ids)
+            last_pk = user_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {rebuilt} user(s); {drifted} had drifted.'))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from organizer.reminders import REMINDER_BATCH_SIZE, dispatch_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Email due task reminders. Runs once, or keeps polling with --loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE,
+                            help='Reminders claimed and sent per batch.')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a worker.')
+        parser.add_argument('--interval', type=float, default=15,
+                            help='Seconds to sleep between polls when --loop is set.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = dispatch_due_reminders(batch_size=options['batch_size'])
+            if sent or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Sent {sent} reminder(s).'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from organizer.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = ('Compile every template through the cached loaders, as the wsgi/asgi entry points do '
+            'at startup when TEMPLATE_WARMUP is set. Fails on any template that does not compile, '
+            'so it doubles as a deploy check.')
+
+    def handle(self, *args, **options):
+        count, elapsed, errors = warm_templates()
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'{len(errors)} template(s) failed to compile.')
+        self.stdout.write(self.style.SUCCESS(f'Compiled {count} templates in {elapsed * 1000:.0f}ms.'))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0003_task_completed_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['user', '-created_at'], name='task_user_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['user', '-created_at'], name='task_user_vault_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', False), ('status__in', ['Pending', 'In Progress'])), fields=['user', 'due_date'], name='task_user_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'Completed')), fields=['user', 'completed_at'], name='task_user_completed_at_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_subtask_counters(apps, schema_editor):
+    Task = apps.get_model('organizer', 'Task')
+    Subtask = apps.get_model('organizer', 'Subtask')
+
+    def subtask_count(**filters):
+        counts = (
+            Subtask.objects.filter(task=OuterRef('pk'), **filters)
+            .order_by()
+            .values('task')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    Task.objects.update(
+        subtask_total=subtask_count(),
+        subtask_completed=subtask_count(is_completed=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0004_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='subtask_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_subtask_counters, migrations.RunPython.noop),
+    ]
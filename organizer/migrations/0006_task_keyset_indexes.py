@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0005_task_subtask_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_active_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_vault_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['user', '-created_at', '-id'], name='task_user_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['user', '-created_at', '-id'], name='task_user_vault_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0007_task_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='recurrence_day',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
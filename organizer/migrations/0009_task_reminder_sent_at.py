@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0008_task_recurrence_day'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('reminder_time__isnull', False)), fields=['reminder_time'], name='task_reminder_due_idx'),
+        ),
+    ]
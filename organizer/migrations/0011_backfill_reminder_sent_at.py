@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import F
+from django.utils import timezone
+
+
+def mark_past_reminders_sent(apps, schema_editor):
+    # Reminders that fell due before the worker existed are stale; without this
+    # its first run would email every one of them, some months late
+    Task = apps.get_model('organizer', 'Task')
+    Task.objects.filter(
+        reminder_time__isnull=False,
+        reminder_sent_at__isnull=True,
+        reminder_time__lte=timezone.now(),
+    ).update(reminder_sent_at=F('reminder_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0010_usertaskstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_past_reminders_sent, migrations.RunPython.noop),
+    ]
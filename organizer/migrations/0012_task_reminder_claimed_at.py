@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizer', '0011_backfill_reminder_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='reminder_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
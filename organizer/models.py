@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, DateField, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate, TruncWeek, TruncMonth
 from django.contrib.auth.models import User
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
+from .cache import invalidate_dashboard
 
 PRIORITY_CHOICES = [
     ('Low', 'Low'),
@@ -22,6 +25,108 @@ RECURRENCE_CHOICES = [
     ('monthly', 'Monthly'),
 ]
 
+HISTOGRAM_PERIODS = {
+    'day': TruncDate,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def _bucket_start(day, period):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(bucket, period):
+    if period == 'week':
+        return bucket + timedelta(weeks=1)
+    if period == 'month':
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def _fill_histogram(counts, start, end, period):
+    histogram = []
+    bucket = _bucket_start(start, period)
+    while bucket <= end:
+        histogram.append({'bucket': bucket, 'count': counts.get(bucket, 0)})
+        bucket = _next_bucket(bucket, period)
+    return histogram
+
+
+class TaskQuerySet(models.QuerySet):
+    def completion_histogram(self, start, end, period='day'):
+        """Count completed tasks per day/week/month between two local dates (inclusive).
+
+        Runs a single grouped query; buckets are truncated in the current time
+        zone (Asia/Manila) and empty buckets are filled with zero.
+        """
+        rows = self._completion_rows(start, end, period)
+        return _fill_histogram({row['bucket']: row['count'] for row in rows}, start, end, period)
+
+    async def acompletion_histogram(self, start, end, period='day'):
+        """Async completion_histogram() for async views."""
+        rows = self._completion_rows(start, end, period)
+        return _fill_histogram({row['bucket']: row['count'] async for row in rows}, start, end, period)
+
+    def _completion_rows(self, start, end, period):
+        tz = timezone.get_current_timezone()
+        trunc = HISTOGRAM_PERIODS[period]
+        range_start = timezone.make_aware(datetime.combine(start, time.min), tz)
+        range_end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+
+        if trunc is TruncDate:
+            bucket_expr = TruncDate('completed_at', tzinfo=tz)
+        else:
+            bucket_expr = trunc('completed_at', output_field=DateField(), tzinfo=tz)
+
+        return (
+            self.filter(status='Completed', completed_at__gte=range_start, completed_at__lt=range_end)
+            .annotate(bucket=bucket_expr)
+            .values('bucket')
+            .annotate(count=Count('id'))
+            .order_by('bucket')
+        )
+
+    def delete(self):
+        """Delete the tasks, then rebuild their users' stats once instead of per row."""
+        from .stats import rebuild_user_stats
+
+        user_ids = list(self.order_by().values_list('user_id', flat=True).distinct())
+        with transaction.atomic(using=self.db):
+            deleted = super().delete()
+            rebuild_user_stats(user_ids)
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def refresh_subtask_counts(self):
+        """Recompute subtask_total/subtask_completed for every task in this queryset.
+
+        Issues a single UPDATE with correlated COUNT subqueries, so it is used
+        after bulk subtask writes that bypass Subtask.save()/delete().
+        """
+        return self.update(
+            subtask_total=_subtask_count(),
+            subtask_completed=_subtask_count(is_completed=True),
+        )
+
+
+def _subtask_count(**filters):
+    counts = (
+        Subtask.objects.filter(task=OuterRef('pk'), **filters)
+        .order_by()
+        .values('task')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
 class Task(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
@@ -31,12 +136,60 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     due_date = models.DateTimeField(null=True, blank=True)
     reminder_time = models.DateTimeField(null=True, blank=True)
+    # Set once the reminder worker has sent (or deliberately skipped) the reminder
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
+    # The reminder worker's lease; a crashed worker's claims expire after REMINDER_LEASE
+    reminder_claimed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
     # New fields
     is_archived = models.BooleanField(default=False)
     recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default='none')
+    # Day of month a monthly series is pinned to, carried over to spawned occurrences
+    recurrence_day = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Denormalized subtask counters, kept in sync by Subtask.save()/delete()
+    # and TaskQuerySet.refresh_subtask_counts() for bulk writes
+    subtask_total = models.PositiveIntegerField(default=0)
+    subtask_completed = models.PositiveIntegerField(default=0)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Dashboard and today lists: active tasks per user, newest first
+            # (id breaks created_at ties for keyset pagination)
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='task_user_active_created_idx',
+                condition=models.Q(is_archived=False),
+            ),
+            # Vault list: archived tasks per user, newest first
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='task_user_vault_created_idx',
+                condition=models.Q(is_archived=True),
+            ),
+            # Overdue filter: open, active tasks ranged on due_date
+            models.Index(
+                fields=['user', 'due_date'],
+                name='task_user_open_due_idx',
+                condition=models.Q(is_archived=False, status__in=['Pending', 'In Progress']),
+            ),
+            # Reminder worker: unsent reminders ranged on reminder_time
+            models.Index(
+                fields=['reminder_time'],
+                name='task_reminder_due_idx',
+                condition=models.Q(reminder_time__isnull=False, reminder_sent_at__isnull=True),
+            ),
+            # Weekly chart: completed tasks ranged on completed_at
+            models.Index(
+                fields=['user', 'completed_at'],
+                name='task_user_completed_at_idx',
+                condition=models.Q(status='Completed'),
+            ),
+        ]
     
     @property
     def is_due_soon(self):
@@ -59,14 +212,66 @@ class Task(models.Model):
 
     @property
     def subtask_stats(self):
-        total = self.subtasks.count()
-        completed = self.subtasks.filter(is_completed=True).count()
+        total = self.subtask_total
+        completed = self.subtask_completed
         return {
             'total': total,
             'completed': completed,
             'percent': int(completed / total * 100) if total > 0 else 0
         }
 
+    # Fields UserTaskStats is derived from; their loaded values are kept so
+    # a later save can be applied to the stats as a delta
+    STATS_FIELDS = ('status', 'is_archived', 'due_date')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stats_state = instance.stats_state()
+        return instance
+
+    def stats_state(self):
+        """(status, is_archived, due_date), or None if any is deferred."""
+        if any(field not in self.__dict__ for field in self.STATS_FIELDS):
+            return None
+        return tuple(self.__dict__[field] for field in self.STATS_FIELDS)
+
+    def sync_subtasks(self, items):
+        """Make this task's checklist match ``items``, a list of (id, title, is_completed).
+
+        Rows are matched by id (``None`` for new rows); unchanged rows are left
+        alone, so the whole sync costs a constant number of statements.
+        """
+        with transaction.atomic():
+            existing = {sub.pk: sub for sub in self.subtasks.all()}
+            to_create = []
+            to_update = []
+            kept = set()
+
+            for pk, title, is_completed in items:
+                sub = existing.get(pk)
+                if sub is None or pk in kept:
+                    to_create.append(Subtask(task=self, title=title, is_completed=is_completed))
+                    continue
+                kept.add(pk)
+                if sub.title != title or sub.is_completed != is_completed:
+                    sub.title = title
+                    sub.is_completed = is_completed
+                    to_update.append(sub)
+
+            stale = existing.keys() - kept
+            if stale:
+                Subtask.objects.filter(task=self, pk__in=stale).delete()
+            if to_update:
+                Subtask.objects.bulk_update(to_update, ['title', 'is_completed'])
+            if to_create:
+                Subtask.objects.bulk_create(to_create)
+
+            # Bulk writes bypass Subtask.save()/delete() and their signals,
+            # so recount and invalidate the cached dashboard once
+            Task.objects.filter(pk=self.pk).refresh_subtask_counts()
+            invalidate_dashboard(self.user_id)
+
     def __str__(self):
         return self.title
 
@@ -76,6 +281,60 @@ class Subtask(models.Model):
     title = models.CharField(max_length=200)
     is_completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Task.objects.filter(pk=self.task_id).update(
+                    subtask_total=F('subtask_total') + 1,
+                    subtask_completed=F('subtask_completed') + int(self.is_completed),
+                )
+            else:
+                Task.objects.filter(pk=self.task_id).refresh_subtask_counts()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Task.objects.filter(pk=self.task_id).refresh_subtask_counts()
+        return result
     
     def __str__(self):
         return self.title
+
+
+class UserTaskStats(models.Model):
+    """Per-user task counters behind the dashboard header.
+
+    Kept current by organizer.stats as tasks change and reconciled by the
+    reconcile_task_stats command. Status counts cover active (unarchived)
+    tasks, like the dashboard list.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='task_stats')
+    pending = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    archived = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+    # Earliest upcoming due date of an open task; once it passes, overdue is recounted
+    next_due_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def open(self):
+        return self.pending + self.in_progress
+
+    @property
+    def score(self):
+        """Share of active tasks that are completed, as a percentage."""
+        total = self.open + self.completed
+        return round(self.completed / total * 100) if total else 0
+
+    @property
+    def score_arc(self):
+        # Length of the score ring's stroke (r=45, circumference ~283)
+        return round(self.score / 100 * 2 * 3.14159 * 45, 1)
+
+    def __str__(self):
+        return f"Task stats for {self.user_id}"
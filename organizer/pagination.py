@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PAGE_SIZE = 30
+
+# Orderings are lists of (field, descending); the last key must be unique
+NEWEST_FIRST = [('created_at', True), ('pk', True)]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(task, ordering=NEWEST_FIRST):
+    """Opaque cursor pointing just past ``task`` in the given ordering."""
+    values = [_encode_value(getattr(task, field)) for field, _ in ordering]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, ordering=NEWEST_FIRST, queryset=None):
+    """Return the cursor's ordering values, or None if it is missing or malformed.
+
+    With ``queryset``, each value is also converted to the type of the column
+    or annotation it is compared with, and a value that does not fit (a
+    string for an id, a list for a date) makes the cursor malformed too.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        values = [_decode_value(value) for value in values]
+        if queryset is not None:
+            values = [
+                queryset.query.resolve_ref(field).output_field.to_python(value)
+                for (field, _), value in zip(ordering, values)
+            ]
+    except (ValueError, TypeError, KeyError, UnicodeError, ValidationError):
+        return None
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+def _after(ordering, values):
+    """Rows strictly after ``values``: (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..."""
+    condition = Q()
+    for i, (field, descending) in enumerate(ordering):
+        lookup = f'{field}__lt' if descending else f'{field}__gt'
+        ties = {prev_field: values[j] for j, (prev_field, _) in enumerate(ordering[:i])}
+        condition |= Q(**ties, **{lookup: values[i]})
+    return condition
+
+
+def _page_queryset(queryset, cursor, page_size, ordering):
+    queryset = queryset.order_by(*[('-' if descending else '') + field for field, descending in ordering])
+    values = decode_cursor(cursor, ordering, queryset)
+    if values:
+        # The redundant bound on the leading key lets the index seek straight to the cursor
+        field, descending = ordering[0]
+        queryset = queryset.filter(
+            _after(ordering, values),
+            **{f'{field}__lte' if descending else f'{field}__gte': values[0]},
+        )
+    # One extra row tells us whether there is a next page
+    return queryset[:page_size + 1]
+
+
+def _split_page(tasks, page_size, ordering):
+    next_cursor = None
+    if len(tasks) > page_size:
+        tasks = tasks[:page_size]
+        next_cursor = encode_cursor(tasks[-1], ordering)
+    return tasks, next_cursor
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE, ordering=NEWEST_FIRST):
+    """Return (tasks, next_cursor) for one page of ``queryset``.
+
+    Seeks past the cursor's (created_at, id) -- or whatever ``ordering`` is
+    given -- instead of using OFFSET, so every page costs the same index range
+    scan no matter how deep the user scrolls.
+    """
+    tasks = list(_page_queryset(queryset, cursor, page_size, ordering))
+    return _split_page(tasks, page_size, ordering)
+
+
+async def akeyset_page(queryset, cursor=None, page_size=PAGE_SIZE, ordering=NEWEST_FIRST):
+    """Async keyset_page() for async views."""
+    tasks = [task async for task in _page_queryset(queryset, cursor, page_size, ordering)]
+    return _split_page(tasks, page_size, ordering)
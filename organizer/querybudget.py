@@ -0,0 +1,199 @@
+"""Per-view query budget instrumentation.
+
+QueryBudgetMiddleware records, for every request, the number of SQL queries,
+time spent in SQL, repeated statements (the N+1 signature) and template
+render time, and keeps the last few hundred samples per view in memory.
+query_budget_snapshot() summarizes them for the staff JSON endpoint and the
+query_budget_report command.
+"""
+import logging
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_WINDOW = 200
+
+_current = ContextVar('query_budget_recorder', default=None)
+_samples = defaultdict(lambda: deque(maxlen=getattr(settings, 'QUERY_BUDGET_WINDOW', QUERY_BUDGET_WINDOW)))
+_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """Collects query and render timings for one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.render_depth = 0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+            # Counted by SQL text without params, so one query per row shows up as repeats
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self):
+        sql, count = self.statements.most_common(1)[0] if self.statements else ('', 0)
+        return (sql[:300], count) if count > 1 else None
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        recorder = _current.get()
+        if recorder is None:
+            return super().render(context, request)
+        # Only the outermost render is timed, so render_to_string inside a view's render is not counted twice
+        recorder.render_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            recorder.render_depth -= 1
+            if not recorder.render_depth:
+                recorder.render_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates report render time to the query budget."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+class QueryBudgetMiddleware:
+    """Record per-view SQL and render cost into the rolling in-process store.
+
+    Enabled by QUERY_BUDGET_ENABLED (defaults to DEBUG). Set
+    QUERY_BUDGET_SERVER_TIMING to add a Server-Timing header. Sync and async
+    capable, so under ASGI it does not push the async views onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.server_timing = getattr(settings, 'QUERY_BUDGET_SERVER_TIMING', False)
+        self.max_queries = getattr(settings, 'QUERY_BUDGET_MAX_QUERIES', 20)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        # The connection the views' ORM calls use lives in the request's sync thread
+        await sync_to_async(_install_recorder)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_recorder)(recorder)
+            _current.reset(token)
+        return self.finish(request, response, recorder, time.perf_counter() - started)
+
+    def finish(self, request, response, recorder, total_time):
+        match = request.resolver_match
+        if match is not None:
+            record(match.view_name or match._func_path, recorder, total_time)
+            if recorder.queries > self.max_queries:
+                logger.warning('%s ran %d queries (budget %d)', match.view_name, recorder.queries, self.max_queries)
+
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'sql;desc="{recorder.queries} queries";dur={recorder.sql_time * 1000:.1f}, '
+                f'render;dur={recorder.render_time * 1000:.1f}, '
+                f'total;dur={total_time * 1000:.1f}'
+            )
+        return response
+
+
+def _install_recorder(recorder):
+    connection.execute_wrappers.append(recorder)
+
+
+def _remove_recorder(recorder):
+    connection.execute_wrappers.remove(recorder)
+
+
+def record(view_name, recorder, total_time):
+    sample = (
+        recorder.queries,
+        recorder.sql_time * 1000,
+        recorder.duplicates,
+        recorder.render_time * 1000,
+        total_time * 1000,
+        recorder.most_repeated(),
+    )
+    with _lock:
+        _samples[view_name].append(sample)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+def _p95(values):
+    return statistics.quantiles(values, n=20)[18] if len(values) > 1 else values[0]
+
+
+def query_budget_snapshot():
+    """Summary of the recorded samples, keyed by view name."""
+    with _lock:
+        samples = {view: list(window) for view, window in _samples.items()}
+
+    snapshot = {}
+    for view, window in samples.items():
+        queries, sql_ms, duplicates, render_ms, total_ms, repeated = zip(*window)
+        worst = max((r for r in repeated if r), key=lambda r: r[1], default=None)
+        snapshot[view] = {
+            'requests': len(window),
+            'queries_avg': round(statistics.fmean(queries), 1),
+            'queries_max': max(queries),
+            'sql_ms_avg': round(statistics.fmean(sql_ms), 2),
+            'duplicates_avg': round(statistics.fmean(duplicates), 1),
+            'render_ms_avg': round(statistics.fmean(render_ms), 2),
+            'total_ms_p50': round(statistics.median(total_ms), 2),
+            'total_ms_p95': round(_p95(total_ms), 2),
+            'most_repeated_sql': {'sql': worst[0], 'count': worst[1]} if worst else None,
+        }
+    return snapshot
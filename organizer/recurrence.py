@@ -0,0 +1,108 @@
+import calendar
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .cache import invalidate_dashboard
+from .models import Subtask, Task
+from .stats import rebuild_user_stats
+
+STEP_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+}
+
+
+def add_months(value, months, anchor_day=None):
+    """Shift ``value`` by ``months``, landing on ``anchor_day`` or the month's last day.
+
+    ``anchor_day`` defaults to ``value.day``; passing the series' original day
+    keeps a task due on the 31st from drifting to the 28th after February.
+    """
+    anchor_day = anchor_day or value.day
+    year, month = divmod(value.year * 12 + value.month - 1 + months, 12)
+    month += 1
+    return value.replace(year=year, month=month, day=min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(due_date, recurrence, count, anchor_day=None, tz=None):
+    """The next ``count`` due dates after ``due_date`` under ``recurrence``.
+
+    Dates are stepped in local wall-clock time, and every occurrence is
+    computed from ``due_date`` directly rather than chained from the one before.
+    """
+    if recurrence not in STEP_DAYS and recurrence != 'monthly':
+        return []
+    local = due_date.astimezone(tz or timezone.get_current_timezone())
+    if recurrence == 'monthly':
+        anchor_day = anchor_day or local.day
+        return [add_months(local, n, anchor_day) for n in range(1, count + 1)]
+    step = STEP_DAYS[recurrence]
+    return [local + timedelta(days=step * n) for n in range(1, count + 1)]
+
+
+def anchor_day_for(task, tz=None):
+    """Day of month a monthly series is pinned to."""
+    return task.recurrence_day or task.due_date.astimezone(tz or timezone.get_current_timezone()).day
+
+
+def next_due_date(task, tz=None):
+    """Due date of the occurrence that follows ``task``, or None if it does not repeat."""
+    if task.recurrence == 'none' or not task.due_date:
+        return None
+    tz = tz or timezone.get_current_timezone()
+    return occurrences(task.due_date, task.recurrence, 1, anchor_day_for(task, tz), tz)[0]
+
+
+def next_due_dates(tasks):
+    """next_due_date() for a batch of tasks, as a list aligned with ``tasks``."""
+    # Resolving the active time zone is the dominant per-call cost, so do it once
+    tz = timezone.get_current_timezone()
+    return [next_due_date(task, tz) for task in tasks]
+
+
+def spawn_next_occurrences(tasks):
+    """Create the next pending occurrence of every recurring task in ``tasks``.
+
+    Spawned tasks and their cloned checklists are written with one
+    bulk_create each, whatever the number of tasks. Returns the new tasks.
+    """
+    tasks = [task for task in tasks if task.recurrence != 'none' and task.due_date]
+    if not tasks:
+        return []
+
+    tz = timezone.get_current_timezone()
+    titles_by_task = {}
+    for task_id, title in (Subtask.objects.filter(task__in=tasks)
+                           .order_by('pk').values_list('task_id', 'title')):
+        titles_by_task.setdefault(task_id, []).append(title)
+
+    new_tasks = [
+        Task(
+            user_id=task.user_id,
+            title=task.title,
+            description=task.description,
+            category=task.category,
+            priority=task.priority,
+            status='Pending',
+            due_date=due_date,
+            recurrence=task.recurrence,
+            recurrence_day=anchor_day_for(task, tz) if task.recurrence == 'monthly' else None,
+            subtask_total=len(titles_by_task.get(task.pk, [])),
+        )
+        for task, due_date in zip(tasks, next_due_dates(tasks))
+    ]
+    Task.objects.bulk_create(new_tasks)
+
+    Subtask.objects.bulk_create([
+        Subtask(task=new_task, title=title, is_completed=False)
+        for task, new_task in zip(tasks, new_tasks)
+        for title in titles_by_task.get(task.pk, [])
+    ])
+
+    # bulk_create skips post_save, so recount stats and invalidate cached dashboards here
+    user_ids = {task.user_id for task in new_tasks}
+    rebuild_user_stats(user_ids)
+    for user_id in user_ids:
+        invalidate_dashboard(user_id)
+    return new_tasks
@@ -0,0 +1,116 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+REMINDER_BATCH_SIZE = 500
+# How long a claimed reminder stays reserved before another worker may retry it
+REMINDER_LEASE = timedelta(minutes=5)
+
+logger = logging.getLogger(__name__)
+
+
+def due_reminders(now=None):
+    """Unsent, unclaimed (or lease-expired) reminders whose time has come; served by task_reminder_due_idx."""
+    now = now or timezone.now()
+    return Task.objects.filter(
+        Q(reminder_claimed_at__isnull=True) | Q(reminder_claimed_at__lte=now - REMINDER_LEASE),
+        reminder_time__isnull=False,
+        reminder_sent_at__isnull=True,
+        reminder_time__lte=now,
+    )
+
+
+def claim_reminders(now=None, batch_size=REMINDER_BATCH_SIZE):
+    """Lease up to ``batch_size`` due reminders and return the ones this call claimed.
+
+    The claim commits before any email goes out and stamps
+    ``reminder_claimed_at``, so other workers skip these rows until the lease
+    runs out; a crashed worker's reminders then come back on their own. On
+    Postgres concurrent workers skip each other's locked rows. SQLite does not
+    lock the SELECT, so only the rows the UPDATE stamped with this claim's
+    time are returned.
+    """
+    now = now or timezone.now()
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        due = due_reminders(now).order_by('reminder_time')
+        if connections[due.db].features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True, of=('self',))
+        pks = list(due.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return []
+        # Re-check the claim condition: another worker may have claimed some since the SELECT
+        due_reminders(now).filter(pk__in=pks).update(reminder_claimed_at=claimed_at)
+    reminders = Task.objects.filter(pk__in=pks, reminder_claimed_at=claimed_at).order_by('reminder_time')
+    return list(reminders.select_related('user').only(
+        'title', 'status', 'is_archived', 'due_date', 'reminder_time', 'reminder_claimed_at',
+        'user__username', 'user__email',
+    ))
+
+
+def _mark_sent(reminders, pks):
+    """Mark the claimed ``pks`` sent, unless re-armed or reclaimed since this batch claimed them."""
+    if pks:
+        Task.objects.filter(pk__in=pks, reminder_claimed_at=reminders[0].reminder_claimed_at).update(
+            reminder_sent_at=timezone.now(),
+        )
+
+
+def build_reminder_email(task):
+    due = timezone.localtime(task.due_date).strftime('%b %d, %Y') if task.due_date else 'no due date'
+    return EmailMessage(
+        subject=f'TASK.IO - Reminder: {task.title}',
+        body=f'''Hello {task.user.username},
+
+This is your reminder for "{task.title}" (due: {due}).
+
+Best regards,
+The TASK.IO Team
+''',
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@taskio.com'),
+        to=[task.user.email],
+    )
+
+
+def dispatch_due_reminders(now=None, batch_size=REMINDER_BATCH_SIZE, connection=None):
+    """Claim and email due reminders in batches over one mail connection.
+
+    Reminders are sent one at a time so a single bad address does not fail
+    the batch, and each batch is marked sent as soon as it is done. Failures
+    are logged and keep their claim, so they are retried once REMINDER_LEASE
+    has passed. Returns the number of reminders sent.
+    """
+    connection = connection or get_connection()
+    sent = 0
+    with connection:
+        while True:
+            reminders = claim_reminders(now, batch_size)
+            if not reminders:
+                break
+
+            done = []
+            for task in reminders:
+                # Finished, archived or address-less reminders are claimed but not emailed
+                if not task.user.email or task.status == 'Completed' or task.is_archived:
+                    done.append(task.pk)
+                    continue
+                try:
+                    sent += connection.send_messages([build_reminder_email(task)]) or 0
+                except Exception:
+                    logger.exception('Could not send the reminder for task %s', task.pk)
+                    # The session may be broken; the backend reopens it on the next send
+                    connection.close()
+                else:
+                    done.append(task.pk)
+            _mark_sent(reminders, done)
+
+            if len(reminders) < batch_size:
+                break
+    return sent
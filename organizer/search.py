@@ -0,0 +1,106 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+# SQLite: external-content FTS5 table over organizer_task, kept in sync by triggers.
+# Django rebuilds SQLite tables for many schema changes, which drops these
+# triggers, so ensure_search_index() reinstalls them after every migrate.
+SQLITE_FTS_TABLE = 'organizer_task_fts'
+
+SQLITE_FTS_TRIGGERS = {
+    'organizer_task_fts_ai': """
+        CREATE TRIGGER IF NOT EXISTS organizer_task_fts_ai AFTER INSERT ON organizer_task BEGIN
+            INSERT INTO organizer_task_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+    'organizer_task_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS organizer_task_fts_ad AFTER DELETE ON organizer_task BEGIN
+            INSERT INTO organizer_task_fts(organizer_task_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    'organizer_task_fts_au': """
+        CREATE TRIGGER IF NOT EXISTS organizer_task_fts_au AFTER UPDATE OF title, description ON organizer_task BEGIN
+            INSERT INTO organizer_task_fts(organizer_task_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO organizer_task_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+# Postgres: GIN expression index; search_tasks() must repeat the exact expression
+POSTGRES_TSVECTOR = (
+    "to_tsvector('english', coalesce(organizer_task.title, '') || ' ' || coalesce(organizer_task.description, ''))"
+)
+POSTGRES_INDEX = 'task_search_tsv_idx'
+
+
+def ensure_search_index(connection):
+    """Create (or repair) the full-text index for the given database connection."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+                "title, description, content='organizer_task', content_rowid='id')"
+            )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'organizer_task'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if not existing.issuperset(SQLITE_FTS_TRIGGERS):
+                for sql in SQLITE_FTS_TRIGGERS.values():
+                    cursor.execute(sql)
+                # Rows may have changed while the triggers were missing
+                cursor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            tsvector = POSTGRES_TSVECTOR.replace('organizer_task.', '')
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON organizer_task USING gin (({tsvector}))"
+            )
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in SQLITE_FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+
+
+def _fts5_query(text):
+    # Quote every word so user input can never be parsed as FTS5 syntax; prefix-match each one
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _tsquery(text):
+    # Only word characters reach to_tsquery(), so none of its operators can; prefix-match
+    # each word as FTS5 does, and require all of them
+    words = re.findall(r'\w+', text)
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def search_tasks(queryset, text):
+    """Filter ``queryset`` to tasks whose title or description matches ``text``."""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = _fts5_query(text)
+        if not match:
+            return queryset
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [match]
+        ))
+    if vendor == 'postgresql':
+        match = _tsquery(text)
+        if not match:
+            return queryset
+        return queryset.filter(RawSQL(
+            f"{POSTGRES_TSVECTOR} @@ to_tsquery('english', %s)", [match], output_field=BooleanField()
+        ))
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
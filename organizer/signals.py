@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_dashboard
+from .models import Subtask, Task
+from .stats import rebuild_user_stats, record_transition
+
+
+def _bulk_deleted(origin, model):
+    return isinstance(origin, models.QuerySet) and origin.model is model
+
+
+def _deleted_by(origin, model):
+    return isinstance(origin, model) or _bulk_deleted(origin, model)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
+
+
+@receiver(post_save, sender=Task)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    old_state = None if created else getattr(instance, '_stats_state', None)
+    new_state = instance.stats_state()
+    if (not created and old_state is None) or new_state is None:
+        # The previous values are unknown (or deferred), so recount instead of applying a delta
+        rebuild_user_stats([instance.user_id])
+    else:
+        record_transition(instance.user_id, old_state, new_state)
+    instance._stats_state = new_state
+
+
+@receiver(post_delete, sender=Task)
+def update_stats_on_delete(sender, instance, origin=None, **kwargs):
+    # The user's stats row goes away with the user, and TaskQuerySet.delete()
+    # rebuilds the stats once when it is done
+    if _deleted_by(origin, User) or _bulk_deleted(origin, Task):
+        return
+    old_state = instance.stats_state()
+    if old_state is None:
+        rebuild_user_stats([instance.user_id])
+    else:
+        record_transition(instance.user_id, old_state, None)
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def invalidate_subtask_dashboard(sender, instance, origin=None, **kwargs):
+    # Cascades from a task delete are already covered by the Task receiver, and
+    # Task.sync_subtasks() invalidates once for the rows it deletes
+    if _deleted_by(origin, Task) or _bulk_deleted(origin, Subtask):
+        return
+    user_id = Task.objects.filter(pk=instance.task_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        invalidate_dashboard(user_id)
@@ -0,0 +1,11 @@
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.archived-item').forEach((item, index) => {
+        item.style.opacity = '0';
+        item.style.transform = 'translateY(10px)';
+        setTimeout(() => {
+            item.style.transition = 'all 0.4s ease';
+            item.style.opacity = '0.7'; // Base opacity for archived items
+            item.style.transform = 'translateY(0)';
+        }, 80 * index);
+    });
+});
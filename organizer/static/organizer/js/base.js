@@ -0,0 +1,159 @@
+function toggleTheme() {
+    const html = document.documentElement;
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+    updateThemeIcon(newTheme);
+}
+
+function updateThemeIcon(theme) {
+    const icon = document.getElementById('theme-icon');
+    if (icon) {
+        icon.textContent = theme === 'dark' ? '☀️' : '🌙';
+    }
+}
+
+function loadMoreTasks(btn) {
+    // data-query (set by the dashboard's search/filter) replaces the plain list params
+    const params = new URLSearchParams(btn.dataset.query
+        ? JSON.parse(btn.dataset.query)
+        : { list: btn.dataset.list, view: btn.dataset.view });
+    params.set('cursor', btn.dataset.cursor);
+    btn.disabled = true;
+    fetch(`${btn.dataset.url}?${params}`)
+        .then(r => r.json())
+        .then(data => {
+            document.getElementById(btn.dataset.target).insertAdjacentHTML('beforeend', data.html);
+            btn.dataset.cursor = data.next_cursor || '';
+            btn.parentElement.style.display = data.next_cursor ? '' : 'none';
+            btn.disabled = false;
+            document.dispatchEvent(new CustomEvent('tasks:loaded', { detail: { list: btn.dataset.list } }));
+        })
+        .catch(() => { btn.disabled = false; });
+}
+
+let timerInterval;
+let timeLeft = 25 * 60;
+let isRunning = false;
+
+function startFocus(taskName) {
+    document.getElementById('focusTaskDisplay').textContent = taskName;
+    const island = document.getElementById('pomodoroIsland');
+    island.style.display = 'block';
+    resetTimer();
+    localStorage.setItem('focusTask', taskName);
+    localStorage.setItem('focusActive', 'true');
+}
+
+function toggleTimer() {
+    const btn = document.getElementById('timerStartBtn');
+    const island = document.getElementById('pomodoroIsland');
+    if (isRunning) {
+        clearInterval(timerInterval);
+        btn.textContent = 'RESUME';
+        island.classList.remove('active');
+        localStorage.setItem('focusRunning', 'false');
+        localStorage.setItem('focusTimeLeft', timeLeft);
+        localStorage.removeItem('focusEndTime');
+    } else {
+        island.classList.add('active');
+        const endTime = Date.now() + (timeLeft * 1000);
+        localStorage.setItem('focusEndTime', endTime);
+        localStorage.setItem('focusRunning', 'true');
+        localStorage.removeItem('focusTimeLeft');
+
+        startInterval();
+        btn.textContent = 'PAUSE';
+    }
+    isRunning = !isRunning;
+}
+
+function startInterval() {
+    clearInterval(timerInterval);
+    timerInterval = setInterval(() => {
+        if (timeLeft <= 0) {
+            clearInterval(timerInterval);
+            alert("Focus cycle complete. Optimal rest interval recommended.");
+            resetTimer();
+            return;
+        }
+        timeLeft--;
+        displayTime();
+    }, 1000);
+}
+
+function displayTime() {
+    const m = Math.floor(timeLeft / 60);
+    const s = timeLeft % 60;
+    document.getElementById('timerDisplay').textContent = `${m.toString().padStart(2, '0')}:${s.toString().padStart(2, '0')}`;
+}
+
+function resetTimer() {
+    clearInterval(timerInterval);
+    timeLeft = 25 * 60;
+    isRunning = false;
+    displayTime();
+    document.getElementById('timerStartBtn').textContent = 'START';
+    document.getElementById('pomodoroIsland').classList.remove('active');
+    localStorage.setItem('focusRunning', 'false');
+    localStorage.setItem('focusTimeLeft', timeLeft);
+    localStorage.removeItem('focusEndTime');
+}
+
+function closeFocus() {
+    document.getElementById('pomodoroIsland').style.display = 'none';
+    clearInterval(timerInterval);
+    localStorage.removeItem('focusActive');
+    localStorage.removeItem('focusRunning');
+    localStorage.removeItem('focusEndTime');
+    localStorage.removeItem('focusTimeLeft');
+    localStorage.removeItem('focusTask');
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    // A theme toggled in this browser wins over the profile's dark_mode setting
+    const savedTheme = localStorage.getItem('theme') || document.documentElement.getAttribute('data-theme');
+    document.documentElement.setAttribute('data-theme', savedTheme);
+    updateThemeIcon(savedTheme);
+
+    // Persistent Timer Initialization
+    const isFocusActive = localStorage.getItem('focusActive') === 'true';
+    if (isFocusActive) {
+        document.getElementById('pomodoroIsland').style.display = 'block';
+        const taskName = localStorage.getItem('focusTask') || 'Focus Session';
+        document.getElementById('focusTaskDisplay').textContent = taskName;
+
+        const isTimerRunning = localStorage.getItem('focusRunning') === 'true';
+        if (isTimerRunning) {
+            const endTime = parseInt(localStorage.getItem('focusEndTime'));
+            const now = Date.now();
+            timeLeft = Math.max(0, Math.floor((endTime - now) / 1000));
+
+            if (timeLeft > 0) {
+                isRunning = true;
+                document.getElementById('timerStartBtn').textContent = 'PAUSE';
+                document.getElementById('pomodoroIsland').classList.add('active');
+                displayTime();
+                startInterval();
+            } else {
+                resetTimer();
+            }
+        } else {
+            timeLeft = parseInt(localStorage.getItem('focusTimeLeft')) || 25 * 60;
+            displayTime();
+            document.getElementById('timerStartBtn').textContent = 'RESUME';
+        }
+    }
+
+    // Subtle Fade In effect
+    const mainContent = document.getElementById('main-content');
+    if (mainContent) {
+        mainContent.style.opacity = '0';
+        setTimeout(() => {
+            mainContent.style.transition = 'opacity 0.6s ease';
+            mainContent.style.opacity = '1';
+        }, 50);
+    }
+});
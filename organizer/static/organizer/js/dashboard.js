@@ -0,0 +1,56 @@
+// Search, filters and sorting run on the server; the page only holds what is visible
+const taskQuery = { q: '', status: '', priority: '', overdue: '', sort: 'newest', render: 'cards' };
+let searchTimer;
+
+function runTaskQuery() {
+    const container = document.getElementById('tasksContainer');
+    const params = new URLSearchParams(taskQuery);
+    fetch(`${container.dataset.queryUrl}?${params}`)
+        .then(r => r.json())
+        .then(data => {
+            container.innerHTML = data.html || `
+                <div class="glass-card" style="grid-column: 1/-1; padding: 5rem; text-align: center;">
+                    <h3 style="font-family: 'Outfit'; margin-bottom: 0.5rem;">NO MATCHING TASKS</h3>
+                </div>`;
+
+            const btn = document.getElementById('tasksContainerLoadMore');
+            btn.dataset.url = container.dataset.queryUrl;
+            btn.dataset.query = JSON.stringify(taskQuery);
+            btn.dataset.cursor = data.next_cursor || '';
+            btn.parentElement.style.display = data.next_cursor ? '' : 'none';
+        });
+}
+
+function searchTasks() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        taskQuery.q = document.getElementById('searchInput').value.trim();
+        runTaskQuery();
+    }, 250);
+}
+
+function filterTasks(f) {
+    document.querySelectorAll('.filter-chip').forEach(b => b.classList.toggle('active', b.dataset.filter === f));
+    taskQuery.status = (f === 'pending' || f === 'completed') ? f : '';
+    taskQuery.priority = ['high', 'medium', 'low'].includes(f) ? f : '';
+    taskQuery.overdue = f === 'overdue' ? 'true' : '';
+    runTaskQuery();
+}
+
+function sortTasks() {
+    taskQuery.sort = document.getElementById('sortSelect').value;
+    runTaskQuery();
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    // Staggered entry for task cards
+    document.querySelectorAll('.task-card').forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+        setTimeout(() => {
+            card.style.transition = 'all 0.5s cubic-bezier(0.4, 0, 0.2, 1)';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, 100 * index);
+    });
+});
@@ -0,0 +1,34 @@
+// Apply premium classes to Django form widgets
+document.addEventListener('DOMContentLoaded', () => {
+    const fields = document.querySelectorAll('#taskForm input, #taskForm textarea, #taskForm select');
+    fields.forEach(f => {
+        if (!f.classList.contains('premium-input')) {
+            f.classList.add('premium-input');
+            if (f.tagName === 'SELECT') f.classList.add('premium-select');
+        }
+    });
+});
+
+function addSubtask() {
+    const container = document.getElementById('subtasksList');
+    const div = document.createElement('div');
+    div.className = 'subtask-item';
+    div.innerHTML = `
+        <div class="cb-wrapper" onclick="toggleCb(this)"></div>
+        <input type="hidden" name="subtask_completed[]" value="false">
+        <input type="hidden" name="subtask_ids[]" value="">
+        <input type="text" name="subtasks[]" class="premium-input" placeholder="Enter objective..." style="padding: 0.6rem 1rem;">
+        <button type="button" class="btn-remove" onclick="this.parentElement.remove()">✕</button>
+    `;
+    container.appendChild(div);
+    div.querySelector('input[type="text"]').focus();
+}
+
+function toggleCb(el) {
+    const isChecked = el.classList.toggle('checked');
+    el.innerHTML = isChecked ? '✓' : '';
+    el.nextElementSibling.value = isChecked ? 'true' : 'false';
+}
+
+// Capture standard form submission to ensure subtasks are handled correctly if needed
+// (Existing backend handles name="subtasks[]", name="subtask_completed[]" and name="subtask_ids[]")
@@ -0,0 +1,11 @@
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('.directive-item').forEach((item, index) => {
+        item.style.opacity = '0';
+        item.style.transform = 'translateY(15px)';
+        setTimeout(() => {
+            item.style.transition = 'all 0.4s ease';
+            item.style.opacity = '1';
+            item.style.transform = 'translateY(0)';
+        }, 100 * index);
+    });
+});
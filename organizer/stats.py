@@ -0,0 +1,98 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import Task, UserTaskStats
+
+OPEN_STATUSES = ('Pending', 'In Progress')
+STATUS_COUNTERS = {
+    'Pending': 'pending',
+    'In Progress': 'in_progress',
+    'Completed': 'completed',
+}
+COUNTERS = ('pending', 'in_progress', 'completed', 'archived', 'overdue')
+
+
+def _contribution(state, now):
+    """The counter deltas one task in ``state`` adds to its user's stats."""
+    counts = Counter()
+    if state is None:
+        return counts
+    status, is_archived, due_date = state
+    if is_archived:
+        counts['archived'] += 1
+    else:
+        counts[STATUS_COUNTERS.get(status, 'pending')] += 1
+        if status in OPEN_STATUSES and due_date and due_date < now:
+            counts['overdue'] += 1
+    return counts
+
+
+def rebuild_user_stats(user_ids):
+    """Recount the stats rows of ``user_ids`` from their tasks with a few grouped queries.
+
+    Used for new rows, bulk writes that bypass signals, and reconciliation.
+    Returns the rebuilt rows.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return []
+    now = timezone.now()
+    rows = {user_id: UserTaskStats(user_id=user_id) for user_id in user_ids}
+    tasks = Task.objects.filter(user_id__in=user_ids).order_by()
+
+    for row in tasks.values('user_id', 'is_archived', 'status').annotate(count=Count('pk')):
+        stats = rows[row['user_id']]
+        field = 'archived' if row['is_archived'] else STATUS_COUNTERS.get(row['status'], 'pending')
+        setattr(stats, field, getattr(stats, field) + row['count'])
+
+    open_tasks = tasks.filter(is_archived=False, status__in=OPEN_STATUSES)
+    for row in open_tasks.filter(due_date__lt=now).values('user_id').annotate(count=Count('pk')):
+        rows[row['user_id']].overdue = row['count']
+    for row in open_tasks.filter(due_date__gte=now).values('user_id').annotate(next_due=Min('due_date')):
+        rows[row['user_id']].next_due_at = row['next_due']
+
+    UserTaskStats.objects.bulk_create(
+        rows.values(),
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=[*COUNTERS, 'next_due_at', 'updated_at'],
+    )
+    return list(rows.values())
+
+
+def get_user_stats(user_id):
+    """The user's stats row, built or refreshed first if missing or if a due date has passed."""
+    stats = UserTaskStats.objects.filter(user_id=user_id).first()
+    if stats is None or (stats.next_due_at and stats.next_due_at <= timezone.now()):
+        (stats,) = rebuild_user_stats([user_id])
+    return stats
+
+
+def record_transition(user_id, old_state, new_state):
+    """Apply one task's change from ``old_state`` to ``new_state`` (None = absent) to its user's stats.
+
+    Rows that do not exist yet, or whose overdue count went stale since a due
+    date passed, are rebuilt from the tasks instead; the rebuild already
+    reflects this change.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        stats = UserTaskStats.objects.select_for_update().filter(user_id=user_id).first()
+        if stats is None or (stats.next_due_at and stats.next_due_at <= now):
+            rebuild_user_stats([user_id])
+            return
+
+        old_counts = _contribution(old_state, now)
+        new_counts = _contribution(new_state, now)
+        for field in COUNTERS:
+            setattr(stats, field, max(getattr(stats, field) + new_counts[field] - old_counts[field], 0))
+
+        if new_state:
+            status, is_archived, due_date = new_state
+            if (status in OPEN_STATUSES and not is_archived and due_date and due_date >= now
+                    and (stats.next_due_at is None or due_date < stats.next_due_at)):
+                stats.next_due_at = due_date
+        stats.save()
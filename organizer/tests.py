@@ -1,3 +1,793 @@
-from django.test import TestCase
+import base64
+import csv
+import json
+import tempfile
+import zoneinfo
+from datetime import datetime
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.signals import post_migrate
+from django.template import TemplateDoesNotExist, engines
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from taskorg.db_profiles import DEFAULT_CONN_MAX_AGE, postgres_database, sqlite_database
+
+from . import querybudget
+from .assets import StaticAssetMiddleware, minify_css, minify_js
+from .cache import dashboard_version
+from .models import Subtask, Task, UserTaskStats
+from .pagination import NEWEST_FIRST, encode_cursor, keyset_page
+from .recurrence import add_months, occurrences, spawn_next_occurrences
+from .reminders import REMINDER_LEASE, claim_reminders, dispatch_due_reminders
+from .search import SQLITE_FTS_TRIGGERS, _fts5_query, _tsquery, search_tasks
+from .stats import COUNTERS, get_user_stats, rebuild_user_stats
+from .views import BULK_MAX_TASKS, EXPORT_HEADER
+from .warmup import warm_templates
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite')
+class TaskIndexUsageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', 'planner@example.com', 'pass12345')
+        Task.objects.create(user=cls.user, title='Open task')
+        Task.objects.create(user=cls.user, title='Archived task', is_archived=True)
+
+    def setUp(self):
+        # Cached dashboard fragments would skip the queries under test
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def assertTaskQueriesUseIndex(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        task_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "organizer_task"' in q['sql']]
+        self.assertTrue(task_queries, f'{url} ran no Task queries')
+        with connection.cursor() as cursor:
+            for sql in task_queries:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' | '.join(row[-1] for row in cursor.fetchall())
+                self.assertIn('organizer_task USING', plan, f'{url}: {plan}')
+                self.assertNotIn('SCAN organizer_task', plan, f'{url}: {plan}')
+
+    def test_dashboard_uses_index(self):
+        self.assertTaskQueriesUseIndex(reverse('organizer_dashboard'))
+
+    def test_overdue_view_uses_index(self):
+        self.assertTaskQueriesUseIndex(reverse('organizer_dashboard') + '?view=overdue')
+
+    def test_today_view_uses_index(self):
+        self.assertTaskQueriesUseIndex(reverse('today_view'))
+
+    def test_vault_view_uses_index(self):
+        self.assertTaskQueriesUseIndex(reverse('vault_list'))
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class DashboardQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('busy', 'busy@example.com', 'pass12345')
+        self.client.force_login(self.user)
+
+    def add_tasks(self, count):
+        now = timezone.now()
+        for i in range(count):
+            task = Task.objects.create(
+                user=self.user, title=f'Task {i}', due_date=now + timezone.timedelta(days=i % 7 - 3),
+                status='Completed' if i % 3 == 0 else 'Pending', completed_at=now if i % 3 == 0 else None,
+            )
+            Subtask.objects.create(task=task, title='Step', is_completed=i % 2 == 0)
+
+    def dashboard_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(reverse('organizer_dashboard')).status_code, 200)
+        return len(ctx)
+
+    def test_query_count_does_not_grow_with_the_task_list(self):
+        self.add_tasks(3)
+        few = self.dashboard_queries()
+        self.add_tasks(40)
+        self.assertEqual(self.dashboard_queries(), few)
+
+    def test_completions_are_bucketed_by_manila_day(self):
+        manila = zoneinfo.ZoneInfo('Asia/Manila')
+        monday, sunday = datetime(2026, 10, 12).date(), datetime(2026, 10, 18).date()
+        completions = [
+            datetime(2026, 10, 12, 0, 5, tzinfo=manila),   # Sunday 16:05 UTC, Monday in Manila
+            datetime(2026, 10, 18, 23, 55, tzinfo=manila),  # Sunday in both
+            datetime(2026, 10, 19, 0, 5, tzinfo=manila),   # Sunday 16:05 UTC, next week in Manila
+            datetime(2026, 10, 11, 23, 55, tzinfo=manila),  # Previous week in Manila
+        ]
+        Task.objects.bulk_create([
+            Task(user=self.user, title=f'Done {i}', status='Completed', completed_at=when)
+            for i, when in enumerate(completions)
+        ])
+        with timezone.override(manila):
+            days = Task.objects.filter(user=self.user).completion_histogram(monday, sunday)
+            weeks = Task.objects.filter(user=self.user).completion_histogram(monday, sunday, period='week')
+        self.assertEqual([entry['bucket'] for entry in days][::6], [monday, sunday])
+        self.assertEqual([entry['count'] for entry in days], [1, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(weeks, [{'bucket': monday, 'count': 2}])
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('pager', 'pager@example.com', 'pass12345')
+        Task.objects.bulk_create([Task(user=cls.user, title=f'Task {i}') for i in range(7)])
+        # Several tasks share a created_at, so only the id breaks the tie
+        tied = timezone.now() - timezone.timedelta(hours=1)
+        Task.objects.filter(user=cls.user, title__in=['Task 1', 'Task 2', 'Task 3', 'Task 4']).update(created_at=tied)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def walk(self, ordering):
+        queryset = Task.objects.filter(user=self.user)
+        pages, cursor = [], None
+        while True:
+            tasks, cursor = keyset_page(queryset, cursor, page_size=2, ordering=ordering)
+            pages.append([task.pk for task in tasks])
+            if cursor is None:
+                return pages
+
+    def test_pages_follow_the_ordering_across_ties(self):
+        for ordering in (NEWEST_FIRST, [('created_at', False), ('pk', False)]):
+            order_by = [('-' if descending else '') + field for field, descending in ordering]
+            expected = list(Task.objects.filter(user=self.user).order_by(*order_by).values_list('pk', flat=True))
+            pages = self.walk(ordering)
+            self.assertEqual([pk for page in pages for pk in page], expected)
+            self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+    def test_malformed_cursors_fall_back_to_the_first_page(self):
+        def raw(values):
+            return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+        task = Task.objects.filter(user=self.user).first()
+        valid = json.loads(base64.urlsafe_b64decode(encode_cursor(task)))
+        cursors = [
+            'not a cursor', raw(['x', 'y']), raw([valid[0], 'abc']), raw([[1], [2]]),
+            raw([{'dt': 5}, 1]), raw([None, None]), raw(valid[:1]), raw({'a': 1}),
+        ]
+        first_page = self.client.get(reverse('task_query')).json()['results']
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('task_query'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['results'], first_page)
+                self.assertEqual(self.client.get(reverse('task_page'), {'cursor': cursor}).status_code, 200)
+                self.assertEqual(self.client.get(reverse('organizer_dashboard'), {'cursor': cursor}).status_code, 200)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Checks the FTS5 index and its query quoting')
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('seeker', 'seeker@example.com', 'pass12345')
+        self.client.force_login(self.user)
+
+    def search(self, text):
+        return sorted(search_tasks(Task.objects.filter(user=self.user), text).values_list('title', flat=True))
+
+    def test_renamed_and_deleted_tasks_leave_the_index(self):
+        task = Task.objects.create(user=self.user, title='Renew passport', description='Bring photos')
+        self.assertEqual(self.search('passport'), ['Renew passport'])
+
+        task.title = 'Renew licence'
+        task.save()
+        self.assertEqual(self.search('passport'), [])
+        self.assertEqual(self.search('licen'), ['Renew licence'])
+        self.assertEqual(self.search('photos'), ['Renew licence'])
+
+        Task.objects.create(user=self.user, title='Renew licence plates')
+        task.delete()
+        self.assertEqual(self.search('licence'), ['Renew licence plates'])
+
+    def test_query_syntax_in_user_input_is_matched_literally(self):
+        Task.objects.create(user=self.user, title='Meet NEAR the station', description='say "hi" to the-team')
+        Task.objects.create(user=self.user, title='Pay rent')
+        for text in ('"hi"', 'NEAR', 'station*', '-team', 'team -rent', 'NEAR(meet station)', 'hi" OR "rent', '*', '"'):
+            with self.subTest(text=text):
+                response = self.client.get(reverse('task_query'), {'q': text})
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search('NEAR'), ['Meet NEAR the station'])
+        self.assertEqual(self.search('"hi"'), ['Meet NEAR the station'])
+        self.assertEqual(self.search('-team'), ['Meet NEAR the station'])
+        self.assertEqual(len(self.search('*')), 2)
+
+    def test_both_backends_prefix_match_every_word(self):
+        self.assertEqual(_fts5_query('licen  "plates" NEAR*'), '"licen"* "plates"* "NEAR"*')
+        self.assertEqual(_tsquery("licen & !plates | (it's):*"), 'licen:* & plates:* & it:* & s:*')
+        self.assertEqual(_tsquery('*'), '')
+
+        Task.objects.create(user=self.user, title='Renew licence plates')
+        Task.objects.create(user=self.user, title='Renew passport')
+        self.assertEqual(self.search('ren lic'), ['Renew licence plates'])
+        self.assertEqual(self.search('ren'), ['Renew licence plates', 'Renew passport'])
+
+    def test_results_are_scoped_to_the_user(self):
+        other = User.objects.create_user('neighbour', 'neighbour@example.com', 'pass12345')
+        Task.objects.create(user=other, title='Water the plants')
+        Task.objects.create(user=self.user, title='Buy plants')
+        results = self.client.get(reverse('task_query'), {'q': 'plants'}).json()['results']
+        self.assertEqual([task['title'] for task in results], ['Buy plants'])
+
+    def test_post_migrate_reinstalls_missing_triggers(self):
+        task = Task.objects.create(user=self.user, title='Old title')
+        # A SQLite table rebuild drops the triggers; rows then change unindexed
+        with connection.cursor() as cursor:
+            for name in SQLITE_FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER {name}')
+        Task.objects.filter(pk=task.pk).update(title='New title')
+
+        config = django_apps.get_app_config('organizer')
+        post_migrate.send(sender=config, app_config=config, verbosity=0, interactive=False,
+                          using=connection.alias, apps=django_apps, plan=[])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'organizer_task'")
+            self.assertTrue(set(SQLITE_FTS_TRIGGERS) <= {row[0] for row in cursor.fetchall()})
+        self.assertEqual(self.search('new'), ['New title'])
+        self.assertEqual(self.search('old'), [])
+
+
+class RecurrenceArithmeticTests(SimpleTestCase):
+    def test_month_end_is_clamped_without_drifting(self):
+        due = local(2026, 1, 31, 9, 0)
+        self.assertEqual(
+            [d.date().isoformat() for d in occurrences(due, 'monthly', 4)],
+            ['2026-02-28', '2026-03-31', '2026-04-30', '2026-05-31'],
+        )
+
+    def test_anchor_day_restores_day_after_short_month(self):
+        self.assertEqual(add_months(local(2026, 2, 28), 1, anchor_day=31).date().isoformat(), '2026-03-31')
+        self.assertEqual(add_months(local(2028, 1, 30), 1).date().isoformat(), '2028-02-29')
+
+    def test_year_rollover(self):
+        self.assertEqual(add_months(local(2026, 12, 15), 1).date().isoformat(), '2027-01-15')
+
+    def test_daily_and_weekly_keep_local_time(self):
+        due = local(2026, 10, 31, 23, 30)
+        self.assertEqual(occurrences(due, 'daily', 2), [local(2026, 11, 1, 23, 30), local(2026, 11, 2, 23, 30)])
+        self.assertEqual(occurrences(due, 'weekly', 1), [local(2026, 11, 7, 23, 30)])
+
+    def test_non_recurring_has_no_occurrences(self):
+        self.assertEqual(occurrences(local(2026, 1, 1), 'none', 3), [])
+
+
+class SpawnOccurrenceTests(TestCase):
+    def test_spawned_monthly_task_keeps_anchor_and_checklist(self):
+        user = User.objects.create_user('repeat', 'repeat@example.com', 'pass12345')
+        task = Task.objects.create(user=user, title='Rent', recurrence='monthly', due_date=local(2026, 1, 31, 9, 0))
+        Subtask.objects.create(task=task, title='Transfer', is_completed=True)
+
+        (february,) = spawn_next_occurrences([task])
+        (march,) = spawn_next_occurrences([february])
+
+        self.assertEqual(timezone.localtime(february.due_date).date().isoformat(), '2026-02-28')
+        self.assertEqual(timezone.localtime(march.due_date).date().isoformat(), '2026-03-31')
+        self.assertEqual(list(march.subtasks.values_list('title', 'is_completed')), [('Transfer', False)])
+        self.assertEqual(march.subtask_total, 1)
+
+
+class SubtaskSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('checklist', 'checklist@example.com', 'pass12345')
+        self.task = Task.objects.create(user=self.user, title='Move house')
+        Subtask.objects.bulk_create([Subtask(task=self.task, title=f'Step {i}') for i in range(50)])
+        self.subtasks = list(self.task.subtasks.order_by('pk'))
+
+    def test_editing_a_long_checklist_costs_a_constant_number_of_statements(self):
+        kept = self.subtasks[10:]
+        items = [(sub.pk, sub.title, False) for sub in kept]
+        items[0] = (kept[0].pk, 'Pack books', False)
+        items[1] = (kept[1].pk, kept[1].title, True)
+        items += [(None, 'Return keys', False), (None, 'Forward mail', True)]
+
+        # Savepoint, two reads, delete, update, insert, recount, release; no query per row
+        with self.assertNumQueries(8):
+            self.task.sync_subtasks(items)
+
+        rows = dict(self.task.subtasks.values_list('title', 'pk'))
+        self.assertEqual(len(rows), 42)
+        # Unchanged and edited rows keep their ids; only the new ones get fresh ids
+        self.assertEqual([rows[title] for title in ['Pack books'] + [sub.title for sub in kept[1:]]],
+                         [sub.pk for sub in kept])
+        self.assertTrue(all(sub.pk not in rows.values() for sub in self.subtasks[:10]))
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.subtask_total, self.task.subtask_completed), (42, 2))
+
+
+class SubtaskCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('counter', 'counter@example.com', 'pass12345')
+        self.task = Task.objects.create(user=self.user, title='Plan trip')
+
+    def assertCounts(self, total, completed, task=None):
+        task = Task.objects.get(pk=(task or self.task).pk)
+        self.assertEqual((task.subtask_total, task.subtask_completed), (total, completed))
+
+    def test_subtask_writes_keep_the_counters_current(self):
+        book = Subtask.objects.create(task=self.task, title='Book flights')
+        Subtask.objects.create(task=self.task, title='Pack', is_completed=True)
+        self.assertCounts(2, 1)
+
+        book.is_completed = True
+        book.save()
+        self.assertCounts(2, 2)
+        book.is_completed = False
+        book.save()
+        self.assertCounts(2, 1)
+
+        book.delete()
+        self.assertCounts(1, 1)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).subtask_stats['percent'], 100)
+
+    def test_bulk_writes_are_recounted_by_refresh_subtask_counts(self):
+        other = Task.objects.create(user=self.user, title='Untouched')
+        Subtask.objects.create(task=other, title='Stays', is_completed=True)
+        Subtask.objects.bulk_create([Subtask(task=self.task, title=f'Step {i}', is_completed=i < 2) for i in range(5)])
+        Subtask.objects.filter(task=self.task, title='Step 4').update(is_completed=True)
+        Subtask.objects.filter(task=self.task, title='Step 0').delete()
+        # Bulk writes bypass Subtask.save()/delete(), so the counters lag until refreshed
+        self.assertCounts(0, 0)
+
+        with self.assertNumQueries(1):
+            updated = Task.objects.filter(user=self.user).refresh_subtask_counts()
+        self.assertEqual(updated, 2)
+        self.assertCounts(4, 2)
+        self.assertCounts(1, 1, task=other)
+
+
+class TaskBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('bulk', 'bulk@example.com', 'pass12345')
+        self.other = User.objects.create_user('bystander', 'bystander@example.com', 'pass12345')
+        self.mine = [Task.objects.create(user=self.user, title=f'Mine {i}') for i in range(2)]
+        self.theirs = Task.objects.create(user=self.other, title='Theirs', recurrence='daily', due_date=local(2026, 3, 1))
+        self.client.force_login(self.user)
+
+    def bulk(self, action, ids):
+        return self.client.post(reverse('task_bulk'), {'action': action, 'ids': ids}, content_type='application/json')
+
+    def test_actions_only_touch_the_users_own_tasks(self):
+        ids = [task.pk for task in self.mine] + [self.theirs.pk]
+        for action, field, value in (('complete', 'status', 'Completed'), ('archive', 'is_archived', True),
+                                     ('unarchive', 'is_archived', False)):
+            response = self.bulk(action, ids)
+            self.assertEqual(response.json()['count'], 2)
+            self.assertEqual({getattr(task, field) for task in Task.objects.filter(user=self.user)}, {value})
+        self.theirs.refresh_from_db()
+        self.assertEqual((self.theirs.status, self.theirs.is_archived), ('Pending', False))
+
+        self.assertEqual(self.bulk('delete', ids).json()['count'], 2)
+        self.assertFalse(Task.objects.filter(user=self.user).exists())
+        self.assertTrue(Task.objects.filter(pk=self.theirs.pk).exists())
+
+    def test_completing_recurring_tasks_spawns_their_next_occurrence(self):
+        rent = Task.objects.create(user=self.user, title='Rent', recurrence='monthly', due_date=local(2026, 1, 31, 9))
+        response = self.bulk('complete', [rent.pk, self.theirs.pk])
+        self.assertEqual((response.json()['count'], response.json()['spawned']), (1, 1))
+        spawned = Task.objects.get(user=self.user, title='Rent', status='Pending')
+        self.assertEqual(timezone.localtime(spawned.due_date).date().isoformat(), '2026-02-28')
+        self.assertEqual(Task.objects.filter(user=self.other).count(), 1)
+
+    def test_bad_payloads_are_rejected(self):
+        url = reverse('task_bulk')
+        bad = [
+            self.client.get(url),
+            self.client.post(url, 'not json', content_type='application/json'),
+            self.client.post(url, [1, 2], content_type='application/json'),
+            self.bulk('complete', ['one']),
+            self.bulk('complete', None),
+            self.bulk('explode', [self.mine[0].pk]),
+            self.bulk('archive', list(range(BULK_MAX_TASKS + 1))),
+        ]
+        self.assertEqual([response.status_code for response in bad], [400] * len(bad))
+        self.assertFalse(Task.objects.filter(status='Completed').exists())
+
+
+class DashboardInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('cached', 'cached@example.com', 'pass12345')
+        self.task = Task.objects.create(user=self.user, title='Cached task')
+        self.client.force_login(self.user)
+
+    def assertInvalidates(self, write):
+        version = dashboard_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        self.assertNotEqual(dashboard_version(self.user.pk), version)
+
+    def test_task_writes_refresh_the_cached_dashboard(self):
+        self.assertContains(self.client.get(reverse('organizer_dashboard')), 'Cached task')
+
+        def rename():
+            self.task.title = 'Renamed task'
+            self.task.save()
+
+        self.assertInvalidates(rename)
+        response = self.client.get(reverse('organizer_dashboard'))
+        self.assertContains(response, 'Renamed task')
+        self.assertNotContains(response, 'Cached task')
+        self.assertInvalidates(lambda: Task.objects.create(user=self.user, title='Another'))
+        self.assertInvalidates(lambda: Task.objects.get(pk=self.task.pk).delete())
+
+    def test_subtask_writes_invalidate_the_dashboard(self):
+        subtask = Subtask.objects.create(task=self.task, title='Step')
+
+        def toggle():
+            subtask.is_completed = True
+            subtask.save()
+
+        self.assertInvalidates(lambda: Subtask.objects.create(task=self.task, title='Another step'))
+        self.assertInvalidates(toggle)
+        self.assertInvalidates(subtask.delete)
+        self.assertInvalidates(lambda: self.task.sync_subtasks([(None, 'Synced', False)]))
+
+    def test_bulk_actions_invalidate_the_dashboard(self):
+        for action in ('complete', 'archive', 'unarchive', 'delete'):
+            with self.subTest(action=action):
+                self.assertInvalidates(lambda: self.client.post(
+                    reverse('task_bulk'), {'action': action, 'ids': [self.task.pk]}, content_type='application/json',
+                ))
+
+
+class TaskExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('exporter', 'exporter@example.com', 'pass12345')
+        other = User.objects.create_user('stranger', 'stranger@example.com', 'pass12345')
+        Task.objects.bulk_create([
+            # Monday 00:30 in Manila is still Sunday in UTC
+            Task(user=cls.user, title='Early Monday', due_date=local(2026, 10, 12, 0, 30)),
+            Task(user=cls.user, title='Late Tuesday', due_date=local(2026, 10, 13, 23, 30), status='Completed'),
+            Task(user=cls.user, title='Archived', due_date=local(2026, 10, 14, 9), is_archived=True),
+            Task(user=cls.user, title='Someday'),
+            Task(user=other, title='Not mine', due_date=local(2026, 10, 12, 9)),
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def exported_titles(self, response):
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], EXPORT_HEADER)
+        return sorted(row[0] for row in rows[1:])
+
+    def test_filters_select_the_exported_rows(self):
+        cases = [
+            ({}, ['Early Monday', 'Late Tuesday', 'Someday']),
+            ({'archived': 'true'}, ['Archived']),
+            ({'archived': 'all'}, ['Archived', 'Early Monday', 'Late Tuesday', 'Someday']),
+            ({'status': 'Completed'}, ['Late Tuesday']),
+            ({'status': 'bogus'}, ['Early Monday', 'Late Tuesday', 'Someday']),
+            ({'due_from': '2026-10-13'}, ['Late Tuesday']),
+            ({'due_to': '2026-10-12'}, ['Early Monday']),
+            ({'due_from': '2026-10-13', 'due_to': '2026-10-14', 'archived': 'all'}, ['Archived', 'Late Tuesday']),
+            ({'due_from': 'not-a-date', 'due_to': '2026-13-45'}, ['Early Monday', 'Late Tuesday', 'Someday']),
+        ]
+        for params, titles in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.exported_titles(self.client.get(reverse('export_csv'), params)), titles)
+
+    async def test_asgi_export_streams_the_same_rows(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('export_csv'), {'archived': 'all', 'due_to': '2026-10-13'})
+        rows = list(csv.reader(b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()))
+        self.assertEqual(rows[0], EXPORT_HEADER)
+        self.assertEqual(sorted(row[0] for row in rows[1:]), ['Early Monday', 'Late Tuesday'])
+
+
+class ReminderDispatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('remind', 'remind@example.com', 'pass12345')
+        past = timezone.now() - timezone.timedelta(minutes=5)
+        self.due = Task.objects.create(user=self.user, title='Call the bank', reminder_time=past)
+        self.done = Task.objects.create(user=self.user, title='Done already', reminder_time=past, status='Completed')
+        self.later = Task.objects.create(
+            user=self.user, title='Later', reminder_time=timezone.now() + timezone.timedelta(hours=1),
+        )
+
+    def test_due_reminders_are_sent_once(self):
+        self.assertEqual(dispatch_due_reminders(batch_size=1), 1)
+        self.assertEqual([m.to for m in mail.outbox], [['remind@example.com']])
+        self.assertIn('Call the bank', mail.outbox[0].subject)
+
+        # A second run (restart or another worker) finds nothing left to send
+        self.assertEqual(dispatch_due_reminders(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+        self.done.refresh_from_db()
+        self.later.refresh_from_db()
+        self.assertIsNotNone(self.done.reminder_sent_at)
+        self.assertIsNone(self.later.reminder_sent_at)
+
+    def test_a_failed_send_releases_only_its_own_reminder(self):
+        bouncing = User.objects.create_user('bounce', 'bounce@example.com', 'pass12345')
+        bad = Task.objects.create(
+            user=bouncing, title='Bounces', reminder_time=timezone.now() - timezone.timedelta(minutes=10),
+        )
+
+        class BouncingBackend(locmem.EmailBackend):
+            def send_messages(self, messages):
+                if any('bounce@example.com' in m.to for m in messages):
+                    raise ConnectionError('mailbox unavailable')
+                return super().send_messages(messages)
+
+        with self.assertLogs('organizer.reminders', 'ERROR'):
+            self.assertEqual(dispatch_due_reminders(connection=BouncingBackend()), 1)
+        self.assertEqual([m.to for m in mail.outbox], [['remind@example.com']])
+
+        bad.refresh_from_db()
+        self.due.refresh_from_db()
+        self.assertIsNone(bad.reminder_sent_at)
+        self.assertIsNotNone(self.due.reminder_sent_at)
+
+        # The failed reminder keeps its lease, then is retried once it runs out
+        self.assertEqual(dispatch_due_reminders(), 0)
+        later = timezone.now() + REMINDER_LEASE
+        self.assertEqual(dispatch_due_reminders(now=later), 1)
+        self.assertEqual(mail.outbox[-1].to, ['bounce@example.com'])
+
+    def test_a_crashed_workers_claims_come_back_after_the_lease(self):
+        self.assertEqual(sorted(task.pk for task in claim_reminders()), [self.due.pk, self.done.pk])
+        # The worker dies here; nothing is sent and the rows are not marked sent
+        self.assertEqual(claim_reminders(), [])
+        self.assertEqual(dispatch_due_reminders(now=timezone.now() + REMINDER_LEASE), 1)
+        self.assertEqual([m.to for m in mail.outbox], [['remind@example.com']])
+
+    def test_only_rows_this_claim_stamped_are_returned(self):
+        real_update = QuerySet.update
+
+        def claimed_by_another_worker(queryset, **kwargs):
+            # Another worker claims the bank reminder between our SELECT and UPDATE
+            if 'reminder_claimed_at' in kwargs:
+                real_update(Task.objects.filter(pk=self.due.pk), reminder_claimed_at=timezone.now())
+            return real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', claimed_by_another_worker):
+            self.assertEqual([task.pk for task in claim_reminders()], [self.done.pk])
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('async', 'async@example.com', 'pass12345')
+        Task.objects.create(user=cls.user, title='Open task', due_date=timezone.now())
+        Task.objects.create(user=cls.user, title='Archived task', is_archived=True)
+        Task.objects.create(user=cls.user, title='Done', status='Completed', completed_at=timezone.now())
+
+    async def test_read_views_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        for name in ('organizer_dashboard', 'today_view', 'vault_list'):
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 200, name)
+
+        response = await self.async_client.get(reverse('export_csv') + '?archived=all')
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(body.strip().splitlines()), 4)
+
+    async def test_anonymous_user_is_redirected(self):
+        response = await self.async_client.get(reverse('organizer_dashboard'))
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_SERVER_TIMING=True)
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        querybudget.reset()
+        self.user = User.objects.create_user('budget', 'budget@example.com', 'pass12345')
+        self.client.force_login(self.user)
+
+    def test_requests_are_recorded_per_view(self):
+        response = self.client.get(reverse('today_view'))
+        self.assertIn('sql;desc=', response['Server-Timing'])
+
+        stats = querybudget.query_budget_snapshot()['today_view']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['queries_avg'], 0)
+        self.assertGreater(stats['render_ms_avg'], 0)
+
+    async def test_async_views_are_recorded_without_a_sync_hop(self):
+        async def get_response(request):
+            return None
+
+        middleware = querybudget.QueryBudgetMiddleware(get_response)
+        self.assertTrue(middleware.async_mode and iscoroutinefunction(middleware))
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('today_view'))
+        self.assertIn('sql;desc=', response['Server-Timing'])
+
+        stats = querybudget.query_budget_snapshot()['today_view']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['queries_avg'], 0)
+        self.assertGreater(stats['render_ms_avg'], 0)
+
+    def test_repeated_statements_are_flagged(self):
+        recorder = querybudget.QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for pk in range(3):
+                list(Task.objects.filter(pk=pk))
+        self.assertEqual(recorder.duplicates, 2)
+        self.assertEqual(recorder.most_repeated()[1], 3)
+
+    def test_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get(reverse('query_budget')).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('query_budget'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('query_budget', response.json()['views'])
+
+
+class UserTaskStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('stats', 'stats@example.com', 'pass12345')
+
+    def assertStatsMatchRebuild(self):
+        stats = UserTaskStats.objects.get(user=self.user)
+        incremental = [getattr(stats, field) for field in COUNTERS]
+        (rebuilt,) = rebuild_user_stats([self.user.pk])
+        self.assertEqual(incremental, [getattr(rebuilt, field) for field in COUNTERS])
+        return rebuilt
+
+    def test_transitions_are_applied_incrementally(self):
+        past = timezone.now() - timezone.timedelta(days=1)
+        late = Task.objects.create(user=self.user, title='Late', due_date=past)
+        done = Task.objects.create(user=self.user, title='Done')
+        Task.objects.create(user=self.user, title='Old', is_archived=True)
+
+        done = Task.objects.get(pk=done.pk)
+        done.status = 'Completed'
+        done.completed_at = timezone.now()
+        done.save()
+        late = Task.objects.get(pk=late.pk)
+        late.status = 'In Progress'
+        late.save()
+
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats.in_progress, stats.completed, stats.archived, stats.overdue), (1, 1, 1, 1))
+
+        Task.objects.get(pk=late.pk).delete()
+        self.assertEqual(self.assertStatsMatchRebuild().overdue, 0)
+
+    def test_queryset_deletes_skip_the_per_task_update(self):
+        for i in range(3):
+            Task.objects.create(user=self.user, title=f'Task {i}')
+        Task.objects.create(user=self.user, title='Done', status='Completed', completed_at=timezone.now())
+        # Bulk deletes are followed by one rebuild instead of a locked update per row
+        with mock.patch('organizer.signals.record_transition') as record:
+            Task.objects.filter(user=self.user, status='Pending').delete()
+        record.assert_not_called()
+        stats = UserTaskStats.objects.get(user=self.user)
+        self.assertEqual((stats.pending, stats.completed), (0, 1))
+
+    def test_overdue_is_recounted_once_a_due_date_passes(self):
+        task = Task.objects.create(user=self.user, title='Soon', due_date=timezone.now() + timezone.timedelta(hours=1))
+        self.assertEqual(get_user_stats(self.user.pk).overdue, 0)
+
+        # Move the due date into the past without going through save()
+        Task.objects.filter(pk=task.pk).update(due_date=timezone.now() - timezone.timedelta(minutes=1))
+        UserTaskStats.objects.filter(user=self.user).update(next_due_at=timezone.now())
+        self.assertEqual(get_user_stats(self.user.pk).overdue, 1)
+
+    def test_dashboard_header_reads_the_stats_row(self):
+        Task.objects.create(user=self.user, title='One')
+        Task.objects.create(user=self.user, title='Two', status='Completed', completed_at=timezone.now())
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('organizer_dashboard'))
+        self.assertContains(response, 'id="pendingCount">1<')
+        self.assertContains(response, 'id="prodScore">50<')
+
+
+class StaticAssetTests(SimpleTestCase):
+    def test_minifiers_keep_strings_and_template_literals(self):
+        self.assertEqual(
+            minify_css('/* c */\n.a > .b {\n    content: "x ,  y";\n    margin: 0 auto;\n}\n'),
+            '.a>.b{content:"x ,  y";margin:0 auto}',
+        )
+        source = '// note\nfunction f() {\n    return `\n    <b>  kept</b>`;\n}\n'
+        self.assertEqual(minify_js(source), 'function f() {\nreturn `\n    <b>  kept</b>`;\n}\n')
+
+    @override_settings(
+        STATIC_MANIFEST=True,
+        STATIC_ROOT=tempfile.mkdtemp(),
+        STORAGES={
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'organizer.assets.CompressedManifestStaticFilesStorage'},
+        },
+    )
+    def test_hashed_bundles_are_served_compressed_and_cached_for_good(self):
+        call_command('collectstatic', interactive=False, verbosity=0, stdout=StringIO())
+        url = static('organizer/css/base.css')
+        self.assertRegex(url, r'base\.[0-9a-f]{12}\.css$')
+
+        middleware = StaticAssetMiddleware(lambda request: None)
+        response = middleware(RequestFactory().get(url, headers={'Accept-Encoding': 'gzip, br;q=0'}))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        response.close()
+
+        async def get_response(request):
+            return None
+
+        # Under ASGI it stays async, so async views are not pushed onto a thread
+        middleware = StaticAssetMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().get(url))
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+
+
+class TemplateWarmupTests(SimpleTestCase):
+    def test_every_template_compiles_into_the_cache(self):
+        count, _, errors = warm_templates()
+        self.assertEqual(errors, [])
+        cached_loader = engines.all()[0].engine.template_loaders[0]
+        self.assertIn('organizer/dashboard.html', cached_loader.get_template_cache)
+        self.assertGreaterEqual(len(cached_loader.get_template_cache), count)
+
+    def test_broken_templates_are_reported_not_raised(self):
+        engine = engines.all()[0].engine
+        get_template = engine.get_template
+        failures = {
+            'organizer/dashboard.html': ImportError('No module named broken_tags'),
+            'organizer/today.html': TemplateDoesNotExist('organizer/missing_parent.html'),
+        }
+
+        def failing_get_template(name):
+            if name in failures:
+                raise failures[name]
+            return get_template(name)
+
+        with mock.patch.object(engine, 'get_template', failing_get_template):
+            with self.assertLogs('organizer.warmup', 'WARNING') as logs:
+                count, _, errors = warm_templates()
+        self.assertEqual(dict(errors), failures)
+        self.assertEqual(len(logs.output), 2)
+        self.assertGreater(count, 0)
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    def test_postgres_pools_or_keeps_connections_open(self):
+        with mock.patch.dict('os.environ', {'POSTGRES_POOL': 'true', 'POSTGRES_POOL_MAX': '4'}):
+            pooled = postgres_database()
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool']['max_size'], 4)
+
+        with mock.patch.dict('os.environ', {'POSTGRES_POOL': 'false', 'CONN_MAX_AGE': '300'}):
+            persistent = postgres_database()
+        self.assertEqual(persistent['CONN_MAX_AGE'], 300)
+        self.assertNotIn('pool', persistent['OPTIONS'])
+
+    def test_connections_are_not_persistent_under_asgi(self):
+        with mock.patch.dict('os.environ', {'POSTGRES_POOL': 'false'}):
+            self.assertEqual(sqlite_database('x.sqlite3')['CONN_MAX_AGE'], DEFAULT_CONN_MAX_AGE)
+            with mock.patch.dict('os.environ', {'DJANGO_SERVER_INTERFACE': 'asgi'}):
+                self.assertEqual(sqlite_database('x.sqlite3')['CONN_MAX_AGE'], 0)
+                self.assertEqual(postgres_database()['CONN_MAX_AGE'], 0)
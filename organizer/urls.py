@@ -12,5 +12,9 @@ urlpatterns = [
     path('vault/', views.vault_view, name='vault_list'),
     path('export/csv/', views.export_tasks_csv, name='export_csv'),
     path('today/', views.today_view, name='today_view'),
+    path('tasks/more/', views.task_page, name='task_page'),
+    path('tasks/query/', views.task_query, name='task_query'),
+    path('tasks/bulk/', views.task_bulk, name='task_bulk'),
     path('update-username/', views.update_username, name='update_username'),
+    path('debug/queries/', views.query_budget, name='query_budget'),
 ]
@@ -1,15 +1,57 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q
+from django.template.loader import render_to_string
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Q, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.cache import cache
 from django.utils import timezone
-from datetime import datetime, timedelta
+from django.utils.safestring import mark_safe
+from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from asgiref.sync import sync_to_async
+import asyncio
 import csv
 import json
 from django.contrib.auth.models import User
-from .models import Task, Subtask
+from .models import Task, PRIORITY_CHOICES, STATUS_CHOICES
+from .cache import DASHBOARD_CACHE_TIMEOUT, adashboard_cache_key, invalidate_dashboard
 from .forms import TaskForm
+from .pagination import NEWEST_FIRST, akeyset_page, keyset_page
+from .querybudget import query_budget_snapshot
+from .recurrence import spawn_next_occurrences
+from .search import search_tasks
+from .stats import get_user_stats, rebuild_user_stats
+
+# Sorts tasks without a due date after every dated task
+NO_DUE_DATE = Value(datetime(9999, 12, 31, tzinfo=dt_timezone.utc), output_field=DateTimeField())
+
+def _subtask_items(request):
+    """Collect (id, title, is_completed) rows from the task form's checklist inputs."""
+    subtask_titles = request.POST.getlist('subtasks[]')
+    subtask_completes = request.POST.getlist('subtask_completed[]')
+    subtask_ids = request.POST.getlist('subtask_ids[]')
+    
+    items = []
+    for i, title in enumerate(subtask_titles):
+        if title.strip():
+            pk = subtask_ids[i] if i < len(subtask_ids) else ''
+            items.append((
+                int(pk) if pk.isdigit() else None,
+                title.strip(),
+                i < len(subtask_completes) and subtask_completes[i] == 'true',
+            ))
+    return items
+
+@login_required
+def query_budget(request):
+    """Staff-only JSON view of the per-view query budget samples."""
+    if not request.user.is_staff:
+        return JsonResponse({'status': 'error', 'message': 'Staff only'}, status=403)
+    return JsonResponse({'status': 'success', 'views': query_budget_snapshot()})
 
 @login_required
 def update_username(request):
@@ -29,40 +71,131 @@ def update_username(request):
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
     return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
 
-@login_required
-def dashboard(request):
-    view = request.GET.get('view', 'all')
-    tasks = Task.objects.filter(user=request.user, is_archived=False)
+# List querysets take the user explicitly so async views can pass the
+# result of request.auser() instead of touching the lazy request.user
+def _dashboard_tasks(user, params):
+    view = params.get('view', 'all')
+    tasks = Task.objects.filter(user=user, is_archived=False)
     
     if view == 'today':
         today = timezone.now().date()
         tasks = tasks.filter(due_date__date=today)
     elif view == 'overdue':
         tasks = tasks.filter(due_date__lt=timezone.now(), status__in=['Pending', 'In Progress'])
+    return tasks
+
+def _today_tasks(user, params):
+    today = timezone.localdate()
+    return Task.objects.filter(
+        Q(created_at__date=today) | Q(due_date__date=today) | ~Q(status='Completed'),
+        user=user, 
+        is_archived=False
+    )
+
+def _vault_tasks(user, params):
+    return Task.objects.filter(user=user, is_archived=True)
+
+# Task lists that support "load more", with the template used for each item
+TASK_LISTS = {
+    'dashboard': (_dashboard_tasks, 'organizer/molecules/task_card.html'),
+    'today': (_today_tasks, 'organizer/molecules/today_item.html'),
+    'vault': (_vault_tasks, 'organizer/molecules/vault_item.html'),
+}
+
+# Sort keys accepted by task_query, as keyset orderings (the last key is unique)
+TASK_SORTS = {
+    'newest': NEWEST_FIRST,
+    'oldest': [('created_at', False), ('pk', False)],
+    'priority': [('priority_rank', False), ('created_at', True), ('pk', True)],
+    'due-date': [('due_sort', False), ('pk', False)],
+}
+
+def _task_json(task):
+    return {
+        'id': task.pk,
+        'title': task.title,
+        'description': task.description,
+        'category': task.category,
+        'priority': task.priority,
+        'status': task.status,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'created_at': task.created_at.isoformat(),
+        'is_overdue': task.is_overdue,
+        'subtasks': task.subtask_stats,
+    }
+
+@login_required
+def task_query(request):
+    """JSON search/filter/sort endpoint for the dashboard task list.
+
+    Accepts ``q``, ``status``, ``priority``, ``overdue``, ``sort`` and ``cursor``;
+    pass ``render=cards`` to also get the page as rendered task cards.
+    """
+    tasks = Task.objects.filter(user=request.user, is_archived=False)
+    
+    q = request.GET.get('q', '').strip()
+    if q:
+        tasks = search_tasks(tasks, q)
+    
+    status = request.GET.get('status', '').lower()
+    if status == 'pending':
+        tasks = tasks.exclude(status='Completed')
+    elif status == 'in progress':
+        tasks = tasks.filter(status='In Progress')
+    elif status == 'completed':
+        tasks = tasks.filter(status='Completed')
+    
+    priority = request.GET.get('priority', '').capitalize()
+    if priority in dict(PRIORITY_CHOICES):
+        tasks = tasks.filter(priority=priority)
+    
+    if request.GET.get('overdue', '').lower() in ('true', '1', 'yes'):
+        tasks = tasks.filter(due_date__lt=timezone.now(), status__in=['Pending', 'In Progress'])
     
-    tasks = tasks.order_by('-created_at')
+    sort = request.GET.get('sort', 'newest')
+    if sort not in TASK_SORTS:
+        sort = 'newest'
+    if sort == 'priority':
+        tasks = tasks.annotate(priority_rank=Case(
+            When(priority='High', then=Value(0)),
+            When(priority='Medium', then=Value(1)),
+            default=Value(2),
+        ))
+    elif sort == 'due-date':
+        tasks = tasks.annotate(due_sort=Coalesce('due_date', NO_DUE_DATE))
     
-    # Weekly Analytics Data (Monday to Sunday)
-    today = timezone.localdate()
+    tasks, next_cursor = keyset_page(tasks, request.GET.get('cursor'), ordering=TASK_SORTS[sort])
+    data = {
+        'status': 'success',
+        'results': [_task_json(task) for task in tasks],
+        'next_cursor': next_cursor,
+    }
+    if request.GET.get('render') == 'cards':
+        data['html'] = ''.join(
+            render_to_string('organizer/molecules/task_card.html', {'task': task}, request=request)
+            for task in tasks
+        )
+    return JsonResponse(data)
+
+async def _weekly_chart(user, today):
+    """Chart bars for the current Mon-Sun week, cached per user version and week."""
     start_of_week = today - timedelta(days=today.weekday())  # Monday
     end_of_week = start_of_week + timedelta(days=6)         # Sunday
     
-    # Get completions for the current week
-    completions = Task.objects.filter(
-        user=request.user,
-        status='Completed',
-        completed_at__date__gte=start_of_week,
-        completed_at__date__lte=end_of_week
-    )
+    key = await adashboard_cache_key(user.pk, 'chart', start_of_week)
+    chart_data = await cache.aget(key)
+    if chart_data is not None:
+        return chart_data
+    
+    # Completions per day for the current week, in one grouped query
+    histogram = await Task.objects.filter(user=user).acompletion_histogram(start_of_week, end_of_week)
     
     # Build chart data (always 7 days Mon-Sun)
     chart_data = []
-    for i in range(7):
-        day = start_of_week + timedelta(days=i)
-        count = completions.filter(completed_at__date=day).count()
+    for entry in histogram:
         chart_data.append({
-            'label': day.strftime('%a'),
-            'count': count,
+            'label': entry['bucket'].strftime('%a'),
+            'count': entry['count'],
             'percent': 0 # Will calculate relative to max below
         })
     
@@ -75,45 +208,101 @@ def dashboard(request):
         # Default fallback if no data
         for d in chart_data:
             d['percent'] = 5
+    
+    await cache.aset(key, chart_data, DASHBOARD_CACHE_TIMEOUT)
+    return chart_data
+
+async def _dashboard_stack(request, user, view, today):
+    """Rendered task stack for one dashboard page; the first page is cached."""
+    cursor = request.GET.get('cursor')
+    key = await adashboard_cache_key(user.pk, 'stack', view, today)
+    if not cursor:
+        stack = await cache.aget(key)
+        if stack is not None:
+            return stack
+    
+    queryset = _dashboard_tasks(user, request.GET)
+    tasks, next_cursor = await akeyset_page(queryset, cursor)
+    stack = {
+        'html': await sync_to_async(render_to_string)(
+            'organizer/organisms/task_stack.html', {'tasks': tasks}, request=request,
+        ),
+        'next_cursor': next_cursor,
+        'task_count': await queryset.acount(),
+    }
+    if not cursor:
+        await cache.aset(key, stack, DASHBOARD_CACHE_TIMEOUT)
+    return stack
+
+@login_required
+async def dashboard(request):
+    view = request.GET.get('view', 'all')
+    if view not in ('all', 'today', 'overdue'):
+        view = 'all'
+    today = timezone.localdate()
+    user = await request.auser()
+    
+    # The task list, the weekly chart and the header stats are independent, so await them together
+    stack, chart_data, stats = await asyncio.gather(
+        _dashboard_stack(request, user, view, today),
+        _weekly_chart(user, today),
+        sync_to_async(get_user_stats)(user.pk),
+    )
             
     # Determine greeting based on session flag set during login
-    greeting = "Welcome" if request.session.get('is_first_login') else "Welcome back"
+    greeting = "Welcome" if await request.session.aget('is_first_login') else "Welcome back"
     
     context = {
-        'tasks': tasks,
+        'task_stack': mark_safe(stack['html']),
+        'task_count': stack['task_count'],
+        'next_cursor': stack['next_cursor'],
         'view': view,
         'greeting': greeting,
         'chart_data': chart_data,
-        'weekly_total': completions.count()
+        'weekly_total': sum(d['count'] for d in chart_data),
+        'stats': stats,
     }
     
-    return render(request, 'organizer/dashboard.html', context)
+    # Templates may touch the session and request.user, so render off the event loop
+    return await sync_to_async(render)(request, 'organizer/dashboard.html', context)
 
 @login_required
-def vault_view(request):
-    tasks = Task.objects.filter(user=request.user, is_archived=True).order_by('-created_at')
-    return render(request, 'organizer/archived.html', {'tasks': tasks})
+async def vault_view(request):
+    queryset = _vault_tasks(await request.auser(), request.GET)
+    (tasks, next_cursor), task_count = await asyncio.gather(
+        akeyset_page(queryset, request.GET.get('cursor')),
+        queryset.acount(),
+    )
+    return await sync_to_async(render)(request, 'organizer/archived.html', {
+        'tasks': tasks,
+        'task_count': task_count,
+        'next_cursor': next_cursor,
+    })
+
+@login_required
+def task_page(request):
+    """JSON "load more" endpoint: the next keyset page of a task list as rendered HTML."""
+    list_name = request.GET.get('list', 'dashboard')
+    if list_name not in TASK_LISTS:
+        return JsonResponse({'status': 'error', 'message': 'Unknown task list'}, status=400)
+    
+    get_tasks, item_template = TASK_LISTS[list_name]
+    tasks, next_cursor = keyset_page(get_tasks(request.user, request.GET), request.GET.get('cursor'))
+    html = ''.join(render_to_string(item_template, {'task': task}, request=request) for task in tasks)
+    return JsonResponse({'status': 'success', 'html': html, 'next_cursor': next_cursor})
 
 @login_required
 def task_create(request):
     if request.method == 'POST':
         form = TaskForm(request.POST)
         if form.is_valid():
-            task = form.save(commit=False)
-            task.user = request.user
-            task.save()
-            
-            # Handle subtasks
-            subtask_titles = request.POST.getlist('subtasks[]')
-            subtask_completes = request.POST.getlist('subtask_completed[]')
-            
-            for i, title in enumerate(subtask_titles):
-                if title.strip():
-                    Subtask.objects.create(
-                        task=task,
-                        title=title.strip(),
-                        is_completed=subtask_completes[i] == 'true'
-                    )
+            with transaction.atomic():
+                task = form.save(commit=False)
+                task.user = request.user
+                task.save()
+                
+                # Handle subtasks
+                task.sync_subtasks(_subtask_items(request))
             
             messages.success(request, 'Task created successfully!')
             return redirect('organizer_dashboard')
@@ -131,20 +320,19 @@ def task_update(request, task_id):
     if request.method == 'POST':
         form = TaskForm(request.POST, instance=task)
         if form.is_valid():
-            task = form.save()
-            
-            # Update subtasks: Simplest way is to remove old and add new
-            task.subtasks.all().delete()
-            subtask_titles = request.POST.getlist('subtasks[]')
-            subtask_completes = request.POST.getlist('subtask_completed[]')
-            
-            for i, title in enumerate(subtask_titles):
-                if title.strip():
-                    Subtask.objects.create(
-                        task=task,
-                        title=title.strip(),
-                        is_completed=subtask_completes[i] == 'true'
-                    )
+            with transaction.atomic():
+                task = form.save(commit=False)
+                if 'due_date' in form.changed_data:
+                    # A manually moved due date starts a new monthly series
+                    task.recurrence_day = None
+                if 'reminder_time' in form.changed_data:
+                    # Re-arm the reminder for the reminder worker
+                    task.reminder_sent_at = None
+                    task.reminder_claimed_at = None
+                task.save()
+                
+                # Update subtasks in place, matched by their submitted ids
+                task.sync_subtasks(_subtask_items(request))
                     
             messages.success(request, 'Task updated successfully!')
             return redirect('organizer_dashboard')
@@ -166,44 +354,65 @@ def task_complete(request, task_id):
     task = get_object_or_404(Task, id=task_id, user=request.user)
     task.status = 'Completed'
     task.completed_at = timezone.now()
-    task.save()
-    
-    # Handle Recurrence
-    if task.recurrence != 'none' and task.due_date:
-        next_due = task.due_date
-        if task.recurrence == 'daily':
-            next_due += timedelta(days=1)
-        elif task.recurrence == 'weekly':
-            next_due += timedelta(weeks=1)
-        elif task.recurrence == 'monthly':
-            # Basic month increment
-            month = next_due.month
-            year = next_due.year + (month // 12)
-            month = (month % 12) + 1
-            day = min(next_due.day, 28)
-            next_due = next_due.replace(year=year, month=month, day=day)
-            
-        new_task = Task.objects.create(
-            user=task.user,
-            title=task.title,
-            description=task.description,
-            category=task.category,
-            priority=task.priority,
-            status='Pending',
-            due_date=next_due,
-            recurrence=task.recurrence
-        )
+    with transaction.atomic():
+        task.save()
         
-        # Clone subtasks
-        for sub in task.subtasks.all():
-            Subtask.objects.create(task=new_task, title=sub.title, is_completed=False)
-            
+        # Handle Recurrence
+        spawned = spawn_next_occurrences([task])
+    if spawned:
+        next_due = spawned[0].due_date
         messages.success(request, f'Task completed! Next occurrence scheduled for {next_due.strftime("%b %d")}.')
     else:
         messages.success(request, f'Task "{task.title}" marked as complete!')
         
     return redirect('organizer_dashboard')
 
+BULK_ACTIONS = ('complete', 'archive', 'unarchive', 'delete')
+BULK_MAX_TASKS = 500
+
+@login_required
+def task_bulk(request):
+    """Apply one action to many of the user's tasks with set-based statements.
+
+    Expects a JSON body: {"action": "complete|archive|unarchive|delete", "ids": [1, 2, ...]}
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    try:
+        data = json.loads(request.body)
+        action = data.get('action')
+        ids = [int(pk) for pk in data.get('ids', [])]
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    
+    if action not in BULK_ACTIONS:
+        return JsonResponse({'status': 'error', 'message': 'Unknown action'}, status=400)
+    if len(ids) > BULK_MAX_TASKS:
+        return JsonResponse({'status': 'error', 'message': f'At most {BULK_MAX_TASKS} tasks per request'}, status=400)
+    
+    tasks = Task.objects.filter(user=request.user, pk__in=ids)
+    spawned = []
+    with transaction.atomic():
+        if action == 'complete':
+            pending = tasks.exclude(status='Completed')
+            recurring = list(pending.exclude(recurrence='none').filter(due_date__isnull=False))
+            count = pending.update(status='Completed', completed_at=timezone.now())
+            spawned = spawn_next_occurrences(recurring)
+        elif action == 'archive':
+            count = tasks.filter(is_archived=False).update(is_archived=True)
+        elif action == 'unarchive':
+            count = tasks.filter(is_archived=True).update(is_archived=False)
+        else:
+            # TaskQuerySet.delete() rebuilds the stats itself
+            count = tasks.delete()[1].get(Task._meta.label, 0)
+        
+        # Queryset updates skip post_save, so recount stats and invalidate the cached dashboard here
+        if action != 'delete':
+            rebuild_user_stats([request.user.pk])
+        invalidate_dashboard(request.user.pk)
+    
+    return JsonResponse({'status': 'success', 'action': action, 'count': count, 'spawned': len(spawned)})
+
 @login_required
 def task_vault(request, task_id):
     task = get_object_or_404(Task, id=task_id, user=request.user)
@@ -220,37 +429,83 @@ def task_unvault(request, task_id):
     messages.success(request, f'Task "{task.title}" restored from archives.')
     return redirect('organizer_dashboard')
 
+def _parse_day(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+class Echo:
+    """Pseudo-buffer whose write() hands the row back so csv.writer can feed a generator."""
+    def write(self, value):
+        return value
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_HEADER = ['Title', 'Description', 'Priority', 'Status', 'Category', 'Due Date', 'Created At']
+EXPORT_COLUMNS = ('title', 'description', 'priority', 'status', 'category', 'due_date', 'created_at')
+
+def _export_row(title, description, priority, status, category, due_date, created_at):
+    return [
+        title,
+        description,
+        priority,
+        status,
+        category,
+        due_date.strftime('%Y-%m-%d') if due_date else '',
+        created_at.strftime('%Y-%m-%d %H:%M')
+    ]
+
 @login_required
-def export_tasks_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="tasks.csv"'
+async def export_tasks_csv(request):
+    tasks = Task.objects.filter(user=await request.auser())
     
-    writer = csv.writer(response)
-    writer.writerow(['Title', 'Description', 'Priority', 'Status', 'Category', 'Due Date', 'Created At'])
+    # Optional filters: ?archived=true|all, ?status=..., ?due_from=YYYY-MM-DD, ?due_to=YYYY-MM-DD
+    archived = request.GET.get('archived', '').lower()
+    if archived in ('true', '1', 'yes'):
+        tasks = tasks.filter(is_archived=True)
+    elif archived != 'all':
+        tasks = tasks.filter(is_archived=False)
     
-    tasks = Task.objects.filter(user=request.user, is_archived=False)
-    for task in tasks:
-        writer.writerow([
-            task.title,
-            task.description,
-            task.priority,
-            task.status,
-            task.category,
-            task.due_date.strftime('%Y-%m-%d') if task.due_date else '',
-            task.created_at.strftime('%Y-%m-%d %H:%M')
-        ])
+    status = request.GET.get('status')
+    if status in dict(STATUS_CHOICES):
+        tasks = tasks.filter(status=status)
+    
+    due_from = _parse_day(request.GET.get('due_from'))
+    if due_from:
+        tasks = tasks.filter(due_date__gte=_start_of_day(due_from))
+    due_to = _parse_day(request.GET.get('due_to'))
+    if due_to:
+        tasks = tasks.filter(due_date__lt=_start_of_day(due_to + timedelta(days=1)))
+    
+    # Only the exported columns, read in server-side chunks
+    writer = csv.writer(Echo())
+    
+    def stream():
+        yield writer.writerow(EXPORT_HEADER)
+        for row in tasks.values_list(*EXPORT_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield writer.writerow(_export_row(*row))
     
+    async def astream():
+        yield writer.writerow(EXPORT_HEADER)
+        # values() rather than values_list(): the tuple iterable runs its query
+        # eagerly on creation, which aiterator() cannot do from the event loop
+        async for row in tasks.values(*EXPORT_COLUMNS).aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield writer.writerow(_export_row(**row))
+    
+    # WSGI servers would buffer an async iterator in full, so only ASGI gets one
+    content = astream() if isinstance(request, ASGIRequest) else stream()
+    response = StreamingHttpResponse(content, content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="tasks.csv"'
     return response
 
 @login_required
-def today_view(request):
-    today = timezone.localdate()
-    tasks = Task.objects.filter(
-        Q(created_at__date=today) | Q(due_date__date=today) | ~Q(status='Completed'),
-        user=request.user, 
-        is_archived=False
-    ).distinct().order_by('priority')
-    return render(request, 'organizer/today.html', {'tasks': tasks})
+async def today_view(request):
+    tasks, next_cursor = await akeyset_page(_today_tasks(await request.auser(), request.GET), request.GET.get('cursor'))
+    return await sync_to_async(render)(request, 'organizer/today.html', {'tasks': tasks, 'next_cursor': next_cursor})
 
 # @login_required
 # def calendar_view(request):
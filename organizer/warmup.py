@@ -0,0 +1,50 @@
+"""Compile every template up front so the first requests don't pay for it.
+
+With the cached template loader each process compiles a template the first
+time it is rendered, along with everything it extends and includes. The
+wsgi/asgi entry points call warm_templates() at startup when
+TEMPLATE_WARMUP is set, so that cost is paid while the worker boots.
+"""
+import logging
+import os
+import time
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_SUFFIXES = ('.html', '.txt', '.xml')
+
+logger = logging.getLogger(__name__)
+
+
+def template_names(engine):
+    """Names of all template files reachable through ``engine``'s loaders."""
+    names = set()
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            for directory in inner.get_dirs():
+                for root, _, files in os.walk(directory):
+                    for filename in files:
+                        if filename.endswith(TEMPLATE_SUFFIXES):
+                            path = os.path.join(root, filename)
+                            names.add(os.path.relpath(path, directory).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    """Compile all templates into the cached loaders; returns (count, seconds, errors)."""
+    started = time.perf_counter()
+    count, errors = 0, []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except (TemplateSyntaxError, TemplateDoesNotExist, ImportError) as e:
+                # A broken template (or a tag library it loads) must not stop the worker booting
+                logger.warning('Could not compile template %s: %s', name, e)
+                errors.append((name, e))
+            else:
+                count += 1
+    return count, time.perf_counter() - started, errors
@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_login_indexes(sender, using, **kwargs):
+    from django.db import connections
+    from .backends import ensure_login_indexes
+    ensure_login_indexes(connections[using])
 
 
 class SecurityManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'security_management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # Reinstall the login lookup indexes that SQLite table rebuilds drop
+        post_migrate.connect(_ensure_login_indexes, sender=self)
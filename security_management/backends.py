@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Case, Index, IntegerField, Q, Value, When
+from django.db.models.functions import Lower
+
+UserModel = get_user_model()
+
+# Expression indexes on auth_user behind the case-insensitive login lookup.
+# auth.User's Meta is not ours to extend, so they are created from a
+# migration (0006, which keeps its own copy) and re-ensured after every
+# migrate (SQLite table rebuilds drop them).
+LOGIN_INDEXES = [
+    Index(Lower('username'), name='auth_user_username_lower_idx'),
+    Index(Lower('email'), name='auth_user_email_lower_idx'),
+]
+
+
+def ensure_login_indexes(connection):
+    with connection.cursor() as cursor:
+        existing = connection.introspection.get_constraints(cursor, UserModel._meta.db_table)
+    with connection.schema_editor() as schema_editor:
+        for index in LOGIN_INDEXES:
+            if index.name not in existing:
+                schema_editor.add_index(UserModel, index)
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """Authenticate with a username or an email address, case-insensitively.
+
+    The account is found with one query served by the lowercase username and
+    email indexes, and the password is hashed exactly once per attempt,
+    including for unknown accounts so they take as long as wrong passwords.
+    """
+
+    def get_login_user(self, login):
+        exact = login.strip()
+        login = exact.lower()
+        return (
+            UserModel._default_manager
+            .alias(username_lower=Lower('username'), email_lower=Lower('email'))
+            .filter(Q(username_lower=login) | Q(email_lower=login))
+            # Usernames are unique only case-sensitively, so "Bob" and "bob" may both
+            # exist: the exact username wins, then a username in another case, then
+            # another account's email
+            .order_by(Case(When(username=exact, then=Value(0)), When(username_lower=login, then=Value(1)),
+                           default=Value(2), output_field=IntegerField()),
+                      'pk')
+            .first()
+        )
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = self.get_login_user(username)
+        if user is None:
+            # Run the hasher once anyway so unknown accounts are not faster to reject
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .profiles import request_profile
+
+
+def profile(request):
+    """Expose the user's Profile as ``profile``, loaded only if a template uses it."""
+    return {'profile': SimpleLazyObject(lambda: request_profile(request))}
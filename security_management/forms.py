@@ -1,6 +1,7 @@
 ﻿from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
+from .images import check_upload
 from .models import Profile
 
 class RegisterForm(UserCreationForm):
@@ -109,8 +110,22 @@ class ProfileEditForm(forms.ModelForm):
             self.fields['last_name'].initial = self.user.last_name
             self.fields['email'].initial = self.user.email
 
+    def clean_profile_picture(self):
+        picture = self.cleaned_data.get('profile_picture')
+        if picture and 'profile_picture' in self.changed_data:
+            try:
+                check_upload(picture)
+            except ValueError as e:
+                raise forms.ValidationError(str(e))
+        return picture
+
     def save(self, commit=True):
         profile = super().save(commit=False)
+        new_picture = 'profile_picture' in self.changed_data
+        if new_picture:
+            # Resized and thumbnailed later by the process_profile_pictures worker
+            profile.avatar_small = profile.avatar_medium = None
+            profile.picture_status = 'pending' if profile.profile_picture else ''
         if self.user:
             self.user.username = self.cleaned_data['username']
             self.user.first_name = self.cleaned_data['first_name']
@@ -119,5 +134,18 @@ class ProfileEditForm(forms.ModelForm):
             if commit:
                 self.user.save()
         if commit:
-            profile.save()
+            # Only this form's fields: the picture worker may have updated the others
+            fields = ['bio']
+            old_pictures = []
+            if new_picture:
+                fields += ['profile_picture', 'avatar_small', 'avatar_medium', 'picture_status']
+                if profile.pk:
+                    # Read just before saving, to include anything the worker wrote since
+                    old_pictures = Profile.objects.filter(pk=profile.pk).values_list(
+                        'profile_picture', 'avatar_small', 'avatar_medium').first() or []
+            profile.save(update_fields=fields if profile.pk else None)
+            storage = profile.profile_picture.storage
+            for name in old_pictures:
+                if name:
+                    storage.delete(name)
         return profile
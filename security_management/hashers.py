@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+# Argon2id cost profiles; memory_cost is in KiB. "interactive" is the OWASP
+# baseline (19 MiB, t=2, p=1). Run calibrate_argon2 to size costs for the
+# hardware and set them with ARGON2_TIME_COST / ARGON2_MEMORY_COST.
+ARGON2_PROFILES = {
+    'interactive': {'time_cost': 2, 'memory_cost': 19 * 1024, 'parallelism': 1},
+    'moderate': {'time_cost': 3, 'memory_cost': 64 * 1024, 'parallelism': 1},
+    'sensitive': {'time_cost': 4, 'memory_cost': 256 * 1024, 'parallelism': 1},
+}
+
+
+def argon2_costs():
+    """(time_cost, memory_cost, parallelism) from ARGON2_PROFILE and any explicit overrides."""
+    profile = ARGON2_PROFILES[getattr(settings, 'ARGON2_PROFILE', 'interactive')]
+    return (
+        getattr(settings, 'ARGON2_TIME_COST', None) or profile['time_cost'],
+        getattr(settings, 'ARGON2_MEMORY_COST', None) or profile['memory_cost'],
+        getattr(settings, 'ARGON2_PARALLELISM', None) or profile['parallelism'],
+    )
+
+
+class ProfiledArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with costs taken from settings instead of Django's fixed defaults.
+
+    Stored hashes whose costs differ from the configured ones fail
+    must_update(), so Django rehashes them the next time the user logs in;
+    the same happens to PBKDF2 hashes while this hasher is listed first.
+    """
+
+    @property
+    def time_cost(self):
+        return argon2_costs()[0]
+
+    @property
+    def memory_cost(self):
+        return argon2_costs()[1]
+
+    @property
+    def parallelism(self):
+        return argon2_costs()[2]
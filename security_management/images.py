@@ -0,0 +1,153 @@
+"""Profile picture processing.
+
+Uploads are only checked against the byte and pixel caps while the request
+is in flight; decoding, resizing and re-encoding happen later in the
+process_profile_pictures worker via process_pending_pictures().
+"""
+import io
+import logging
+import secrets
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import Profile
+from .profiles import invalidate_profile
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+MAX_UPLOAD_PIXELS = 40_000_000
+# Longest edge of the stored picture
+MAX_DIMENSION = 1024
+# Square avatar sizes by Profile field: the 36px navbar and 120px profile avatars at 2x and above
+AVATAR_SIZES = {
+    'avatar_small': 96,
+    'avatar_medium': 256,
+}
+PICTURE_BATCH_SIZE = 20
+# A claimed picture is picked up again after this long if its worker dies
+PICTURE_LEASE = timedelta(minutes=10)
+
+WEBP = features.check('webp')
+
+
+def check_upload(upload):
+    """Raise ValueError if ``upload`` breaks the byte or pixel caps; reads only the image header."""
+    if upload.size > MAX_UPLOAD_BYTES:
+        raise ValueError(f'Images must be smaller than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.')
+    position = upload.tell()
+    try:
+        with Image.open(upload) as image:
+            width, height = image.size
+    except (UnidentifiedImageError, OSError):
+        raise ValueError('Upload a valid image.')
+    finally:
+        upload.seek(position)
+    if width * height > MAX_UPLOAD_PIXELS:
+        raise ValueError(f'Images must be under {MAX_UPLOAD_PIXELS // 1_000_000} megapixels.')
+
+
+def _encode(image):
+    """Re-encode without EXIF/ICC/XMP; WebP when Pillow has it, otherwise JPEG."""
+    buffer = io.BytesIO()
+    if WEBP:
+        image.save(buffer, 'WEBP', quality=80, method=4)
+        return buffer.getvalue(), 'webp'
+    image.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+    return buffer.getvalue(), 'jpg'
+
+
+def render_picture(data):
+    """Return {'profile_picture': (bytes, ext), 'avatar_small': ..., 'avatar_medium': ...} for raw upload bytes."""
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width * image.height > MAX_UPLOAD_PIXELS:
+            raise ValueError('Image is too large')
+        # Let the JPEG decoder skip detail the output will never show
+        image.draft('RGB', (MAX_DIMENSION, MAX_DIMENSION))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') and WEBP else 'RGB')
+
+        picture = image.copy()
+        picture.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
+        outputs = {'profile_picture': _encode(picture)}
+        for field, size in AVATAR_SIZES.items():
+            outputs[field] = _encode(ImageOps.fit(picture, (size, size), Image.Resampling.LANCZOS))
+    return outputs
+
+
+def claim_pending_pictures(batch_size=PICTURE_BATCH_SIZE, now=None):
+    """Lease up to ``batch_size`` profiles waiting for processing and return them.
+
+    Claiming marks them processing and stamps ``picture_claimed_at``; rows
+    whose lease has run out are claimed again, so a crashed worker's
+    pictures are not stuck in processing.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = Profile.objects.filter(
+            Q(picture_status='pending') | Q(picture_status='processing', picture_claimed_at__lt=now - PICTURE_LEASE)
+        ).order_by('pk')
+        if connections[due.db].features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        profiles = list(due[:batch_size])
+        for profile in profiles:
+            profile.picture_status = 'processing'
+            profile.picture_claimed_at = now
+        Profile.objects.bulk_update(profiles, ['picture_status', 'picture_claimed_at'])
+    return profiles
+
+
+def process_profile_picture(profile):
+    """Replace the stored upload with its processed version and thumbnails.
+
+    The result is only written if the row still holds the claimed upload
+    under this worker's lease; a newer upload or a reclaimed lease wins, and
+    the files made here are discarded.
+    """
+    original = profile.profile_picture
+    claimed = Profile.objects.filter(
+        pk=profile.pk, picture_status='processing',
+        picture_claimed_at=profile.picture_claimed_at, profile_picture=original.name,
+    )
+    try:
+        with original.open('rb') as f:
+            outputs = render_picture(f.read())
+    except Exception:
+        # A superseded upload may already be gone; only a current claim is a failure
+        if claimed.update(picture_status='failed'):
+            logger.exception('Could not process the profile picture of user %s', profile.user_id)
+            invalidate_profile(profile.user_id)
+        return False
+
+    token = secrets.token_hex(4)
+    old_name = original.name
+    names = {}
+    for field, (content, ext) in outputs.items():
+        file = getattr(profile, field)
+        file.save(f'{profile.user_id}-{token}.{ext}', ContentFile(content), save=False)
+        names[field] = file.name
+    if not claimed.update(picture_status='ready', **names):
+        for name in names.values():
+            original.storage.delete(name)
+        return False
+    invalidate_profile(profile.user_id)
+    if old_name != names['profile_picture']:
+        original.storage.delete(old_name)
+    return True
+
+
+def process_pending_pictures(batch_size=PICTURE_BATCH_SIZE):
+    """Drain the pending queue; returns the number of pictures processed."""
+    processed = 0
+    while True:
+        profiles = claim_pending_pictures(batch_size)
+        if not profiles:
+            return processed
+        processed += sum(process_profile_picture(profile) for profile in profiles)
+        if len(profiles) < batch_size:
+            return processed
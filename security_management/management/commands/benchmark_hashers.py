@@ -0,0 +1,47 @@
+import time
+
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, check_password, get_hasher, make_password,
+)
+from django.core.management.base import BaseCommand
+
+from security_management.hashers import argon2_costs
+
+BENCH_PASSWORD = 'bench-pass-123'
+
+
+class Command(BaseCommand):
+    help = ('Report logins per core-second for Django\'s default PBKDF2 and Argon2 settings and for '
+            'the configured hasher, and check that old hashes are upgraded on login.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=10, help='Password checks per hasher.')
+
+    def handle(self, *args, **options):
+        configured = get_hasher('default')
+        time_cost, memory_cost, parallelism = argon2_costs()
+        hashers = [
+            ('PBKDF2 (Django default)', PBKDF2PasswordHasher()),
+            ('Argon2 (Django default)', Argon2PasswordHasher()),
+            (f'{configured.algorithm} (configured: t={time_cost} m={memory_cost // 1024}MiB p={parallelism})',
+             configured),
+        ]
+
+        self.stdout.write(f"{'hasher':<52}{'wall ms':>9}{'cpu ms':>9}{'logins/core-s':>15}")
+        for label, hasher in hashers:
+            encoded = hasher.encode(BENCH_PASSWORD, hasher.salt())
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for _ in range(options['rounds']):
+                hasher.verify(BENCH_PASSWORD, encoded)
+            wall = (time.perf_counter() - wall_start) * 1000 / options['rounds']
+            cpu = (time.process_time() - cpu_start) * 1000 / options['rounds']
+            self.stdout.write(f'{label:<52}{wall:>9.1f}{cpu:>9.1f}{1000 / cpu:>15.1f}')
+
+        # A login with an old PBKDF2 hash should hand back a rehash in the configured format
+        rehashed = []
+        legacy = make_password(BENCH_PASSWORD, hasher='pbkdf2_sha256')
+        check_password(BENCH_PASSWORD, legacy, setter=lambda raw: rehashed.append(make_password(raw)))
+        if rehashed and rehashed[0].startswith(configured.algorithm):
+            self.stdout.write(self.style.SUCCESS(f'PBKDF2 hashes are rehashed to {configured.algorithm} on login.'))
+        else:
+            self.stdout.write(self.style.WARNING('PBKDF2 hashes are not rehashed on login.'))
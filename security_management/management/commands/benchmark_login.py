@@ -0,0 +1,88 @@
+import statistics
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+BENCH_PASSWORD = 'bench-pass-123'
+
+
+def legacy_login(username_or_email, password):
+    """The old login_view flow: username first, then an email lookup and a second hash."""
+    backend = ModelBackend()
+    user = backend.authenticate(None, username=username_or_email, password=password)
+    if user is None:
+        try:
+            user_obj = User.objects.get(email=username_or_email)
+            user = backend.authenticate(None, username=user_obj.username, password=password)
+        except (User.DoesNotExist, User.MultipleObjectsReturned):
+            pass
+    return user
+
+
+def backend_login(username_or_email, password):
+    return authenticate(None, username=username_or_email, password=password)
+
+
+FLOWS = {
+    'legacy': legacy_login,
+    'backend': backend_login,
+}
+
+SCENARIOS = {
+    'username': ('bench0', BENCH_PASSWORD),
+    'email': ('bench0@example.com', BENCH_PASSWORD),
+    'wrong password': ('bench0@example.com', 'not-the-password'),
+    'unknown account': ('nobody@example.com', BENCH_PASSWORD),
+}
+
+
+class Command(BaseCommand):
+    help = ('Measure wall time, CPU time and queries per login attempt for the old '
+            'two-step login flow and the username-or-email backend, on a throwaway database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000, help='Accounts in the table.')
+        parser.add_argument('--attempts', type=int, default=20, help='Attempts per scenario and flow.')
+        parser.add_argument('--flows', nargs='+', choices=list(FLOWS), default=list(FLOWS))
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self._seed(options['users'])
+            self.stdout.write(f"{'flow':<9}{'scenario':<17}{'wall ms':>9}{'cpu ms':>9}{'queries':>9}")
+            for flow in options['flows']:
+                for scenario, credentials in SCENARIOS.items():
+                    wall, cpu, queries = self._measure(FLOWS[flow], credentials, options['attempts'])
+                    self.stdout.write(f'{flow:<9}{scenario:<17}{wall:>9.1f}{cpu:>9.1f}{queries:>9}')
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def _seed(self, count):
+        # Hash once and share it; per-user hashing would dominate the setup time
+        template = User(username='template')
+        template.set_password(BENCH_PASSWORD)
+        User.objects.bulk_create([
+            User(username=f'bench{i}', email=f'bench{i}@example.com', password=template.password)
+            for i in range(count)
+        ], batch_size=5000)
+
+    def _measure(self, login, credentials, attempts):
+        walls, cpus = [], []
+        for _ in range(attempts):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            login(*credentials)
+            walls.append((time.perf_counter() - wall_start) * 1000)
+            cpus.append((time.process_time() - cpu_start) * 1000)
+        with CaptureQueriesContext(connection) as queries:
+            login(*credentials)
+        return statistics.median(walls), statistics.median(cpus), len(queries)
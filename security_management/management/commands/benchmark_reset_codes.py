@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+
+from security_management.management.commands.reap_reset_codes import reap
+from security_management.models import PasswordResetCode
+
+SEED_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = ('Time the reset-code verification lookup as the table grows, then time the reaper, '
+            'on a throwaway database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+                            help='Table sizes to measure at.')
+        parser.add_argument('--lookups', type=int, default=500, help='Verification lookups per size.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self._run(sorted(options['sizes']), options['lookups'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def _run(self, sizes, lookups):
+        rng = random.Random(42)
+        users = User.objects.bulk_create([User(username=f'bench{i}') for i in range(1000)])
+        now = timezone.now()
+        rows = 0
+        self.stdout.write(f"{'codes':>10}{'lookup us':>12}  plan")
+        for size in sizes:
+            while rows < size:
+                batch = min(SEED_BATCH_SIZE, size - rows)
+                PasswordResetCode.objects.bulk_create([
+                    PasswordResetCode(
+                        user=rng.choice(users),
+                        code=f'{rng.randrange(10 ** 6):06d}',
+                        # Mostly stale rows, as an unreaped table would hold
+                        expires_at=now + timedelta(minutes=rng.randint(-60 * 24 * 90, 15)),
+                        is_used=rng.random() < 0.3,
+                    )
+                    for _ in range(batch)
+                ])
+                rows += batch
+
+            probes = [(rng.choice(users), f'{rng.randrange(10 ** 6):06d}') for _ in range(lookups)]
+            timings = []
+            for user, code in probes:
+                started = time.perf_counter()
+                PasswordResetCode.objects.filter(user=user, code=code, is_used=False).first()
+                timings.append((time.perf_counter() - started) * 1_000_000)
+            self.stdout.write(f'{size:>10,}{statistics.median(timings):>12.0f}  {self._plan(*probes[0])}')
+
+        started = time.perf_counter()
+        deleted = reap(PasswordResetCode.expired(), 1000) + reap(PasswordResetCode.objects.filter(is_used=True), 1000)
+        self.stdout.write(f'Reaped {deleted:,} of {rows:,} codes in {time.perf_counter() - started:.2f}s')
+
+    def _plan(self, user, code):
+        if connection.vendor != 'sqlite':
+            return ''
+        sql, params = PasswordResetCode.objects.filter(user=user, code=code, is_used=False)[:1].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return ' | '.join(row[-1] for row in cursor.fetchall())
@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from argon2.low_level import Type, hash_secret
+from django.core.management.base import BaseCommand, CommandError
+
+
+def time_hash(time_cost, memory_cost, parallelism, rounds=5):
+    """Median milliseconds for one Argon2id hash with the given costs."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hash_secret(b'calibration-password', b'calibration-salt', time_cost=time_cost,
+                    memory_cost=memory_cost, parallelism=parallelism, hash_len=32, type=Type.ID)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = ('Find Argon2id costs that hash within a latency budget on this machine and print '
+            'the settings to use. Memory is preferred over passes, as RFC 9106 recommends.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=50, help='Latency budget per hash.')
+        parser.add_argument('--max-memory-mib', type=int, default=64, help='Memory ceiling per hash.')
+        parser.add_argument('--min-memory-mib', type=int, default=19, help='Memory floor (OWASP baseline).')
+        parser.add_argument('--parallelism', type=int, default=1, help='Lanes per hash.')
+
+    def handle(self, *args, **options):
+        target = options['target_ms']
+        parallelism = options['parallelism']
+        memory_mib = options['max_memory_mib']
+
+        # Shrink memory until a single pass fits the budget...
+        while True:
+            elapsed = time_hash(1, memory_mib * 1024, parallelism)
+            self.stdout.write(f'  t=1 m={memory_mib}MiB: {elapsed:.1f}ms')
+            if elapsed <= target or memory_mib <= options['min_memory_mib']:
+                break
+            memory_mib = max(memory_mib // 2, options['min_memory_mib'])
+        if elapsed > target:
+            raise CommandError(f'Even t=1 at {memory_mib}MiB takes {elapsed:.1f}ms; raise --target-ms.')
+
+        # ...then add passes while they still fit
+        time_cost = 1
+        while True:
+            elapsed_next = time_hash(time_cost + 1, memory_mib * 1024, parallelism)
+            self.stdout.write(f'  t={time_cost + 1} m={memory_mib}MiB: {elapsed_next:.1f}ms')
+            if elapsed_next > target:
+                break
+            time_cost += 1
+            elapsed = elapsed_next
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Argon2id t={time_cost} m={memory_mib}MiB p={parallelism}: {elapsed:.1f}ms per hash, '
+            f'about {1000 / (elapsed * parallelism):.1f} logins per core-second'
+        ))
+        self.stdout.write(f'ARGON2_TIME_COST={time_cost}')
+        self.stdout.write(f'ARGON2_MEMORY_COST={memory_mib * 1024}')
+        self.stdout.write(f'ARGON2_PARALLELISM={parallelism}')
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from security_management.images import PICTURE_BATCH_SIZE, process_pending_pictures
+
+
+class Command(BaseCommand):
+    help = ('Resize uploaded profile pictures and generate their avatar thumbnails. '
+            'Runs once, or keeps polling with --loop.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PICTURE_BATCH_SIZE,
+                            help='Profiles claimed per batch.')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a worker.')
+        parser.add_argument('--interval', type=float, default=2,
+                            help='Seconds to sleep between polls when --loop is set.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_pending_pictures(batch_size=options['batch_size'])
+            if processed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Processed {processed} picture(s).'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
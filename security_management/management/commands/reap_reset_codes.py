@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from security_management.models import PasswordResetCode
+from security_management.outbox import finished_outbox
+
+
+def reap(queryset, batch_size, pause=0):
+    """Delete ``queryset`` in primary-key chunks, each in its own short statement."""
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=pks).delete()[0]
+        if len(pks) < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = ('Delete expired and used password reset codes, and old sent or failed outbox emails, '
+            'in bounded chunks. Safe to run from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Codes deleted per statement.')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to sleep between chunks, to leave room for other writers.')
+
+    def handle(self, *args, **options):
+        batch_size, pause = options['batch_size'], options['pause']
+        expired = reap(PasswordResetCode.expired(), batch_size, pause)
+        # Whatever is left has not expired yet, so this scan stays small
+        used = reap(PasswordResetCode.objects.filter(is_used=True), batch_size, pause)
+        emails = reap(finished_outbox(), batch_size, pause)
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {expired} expired and {used} used reset code(s) and {emails} outbox email(s).'
+        ))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from security_management.outbox import OUTBOX_BATCH_SIZE, drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails. Runs once, or keeps polling with --loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE,
+                            help='Messages claimed per batch.')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a worker.')
+        parser.add_argument('--interval', type=float, default=2,
+                            help='Seconds to sleep between polls when --loop is set.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = drain_outbox(batch_size=options['batch_size'])
+            if sent or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Sent {sent} email(s).'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Index
+from django.db.models.functions import Lower
+
+# Expression indexes behind the case-insensitive login lookup; auth.User's
+# Meta is not ours to extend. Kept in step with backends.LOGIN_INDEXES.
+INDEXES = [
+    Index(Lower('username'), name='auth_user_username_lower_idx'),
+    Index(Lower('email'), name='auth_user_email_lower_idx'),
+]
+
+
+def _existing_indexes(schema_editor, model):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        return connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+
+def create_login_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    existing = _existing_indexes(schema_editor, User)
+    for index in INDEXES:
+        if index.name not in existing:
+            schema_editor.add_index(User, index)
+
+
+def remove_login_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    existing = _existing_indexes(schema_editor, User)
+    for index in INDEXES:
+        if index.name in existing:
+            schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_management', '0005_outboxemail'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_login_indexes, remove_login_indexes),
+    ]
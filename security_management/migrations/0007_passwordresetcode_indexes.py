@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_management', '0006_login_lookup_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresetcode',
+            index=models.Index(fields=['user', 'code', 'is_used'], name='reset_code_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresetcode',
+            index=models.Index(fields=['expires_at'], name='reset_code_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_existing_pictures(apps, schema_editor):
+    Profile = apps.get_model('security_management', 'Profile')
+    Profile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True).update(picture_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_management', '0008_backfill_profiles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_medium',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pics/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_small',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pics/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='picture_status',
+            field=models.CharField(blank=True, choices=[('', 'None'), ('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('picture_status', 'pending')), fields=['id'], name='profile_picture_pending_idx'),
+        ),
+        migrations.RunPython(queue_existing_pictures, migrations.RunPython.noop),
+    ]
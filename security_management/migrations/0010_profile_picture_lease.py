@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_management', '0009_profile_picture_thumbnails'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='profile',
+            name='profile_picture_pending_idx',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='picture_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('picture_status__in', ['pending', 'processing'])), fields=['id'], name='profile_picture_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security_management', '0010_profile_picture_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='kind',
+            field=models.CharField(blank=True, choices=[('', 'Message'), ('reset_code', 'Reset code')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='outboxemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', max_length=10),
+        ),
+    ]
@@ -5,14 +5,45 @@ import random
 import string
 
 class Profile(models.Model):
+    PICTURE_STATUS_CHOICES = [
+        ('', 'None'),
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    # Square thumbnails generated from profile_picture by process_profile_pictures
+    avatar_small = models.ImageField(upload_to='profile_pics/thumbs/', blank=True, null=True)
+    avatar_medium = models.ImageField(upload_to='profile_pics/thumbs/', blank=True, null=True)
+    picture_status = models.CharField(max_length=10, choices=PICTURE_STATUS_CHOICES, default='', blank=True)
+    picture_claimed_at = models.DateTimeField(null=True, blank=True)
     dark_mode = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Serves the picture worker's poll for new uploads and expired leases
+            models.Index(fields=['id'], name='profile_picture_queue_idx',
+                         condition=models.Q(picture_status__in=['pending', 'processing'])),
+        ]
+
     def __str__(self):
         return self.user.username
 
+    @property
+    def avatar_small_url(self):
+        """Small avatar, or the original upload until the worker has processed it"""
+        picture = self.avatar_small or self.profile_picture
+        return picture.url if picture else ''
+
+    @property
+    def avatar_medium_url(self):
+        picture = self.avatar_medium or self.profile_picture
+        return picture.url if picture else ''
+
 
 class PasswordResetCode(models.Model):
     """Model to store 6-digit verification codes for password reset (Facebook-style)"""
@@ -22,6 +53,14 @@ class PasswordResetCode(models.Model):
     expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # verify_reset_code_view looks codes up by all three columns
+            models.Index(fields=['user', 'code', 'is_used'], name='reset_code_lookup_idx'),
+            # reap_reset_codes ranges on expires_at
+            models.Index(fields=['expires_at'], name='reset_code_expires_idx'),
+        ]
+
     def __str__(self):
         return f"Reset code for {self.user.username}"
 
@@ -29,6 +68,16 @@ class PasswordResetCode(models.Model):
         """Check if the code is still valid (not expired and not used)"""
         return not self.is_used and timezone.now() < self.expires_at
 
+    @classmethod
+    def expired(cls, now=None):
+        """Codes past their expiry, used or not; served by reset_code_expires_idx"""
+        return cls.objects.filter(expires_at__lt=now or timezone.now())
+
+    @staticmethod
+    def account_for(email):
+        """The account a reset for ``email`` applies to; the oldest when several share it"""
+        return User.objects.filter(email=email).order_by('pk').first()
+
     @classmethod
     def generate_code(cls, user):
         """Generate a new 6-digit code for the user"""
@@ -42,3 +91,45 @@ class PasswordResetCode(models.Model):
         expires_at = timezone.now() + timezone.timedelta(minutes=15)
         
         return cls.objects.create(user=user, code=code, expires_at=expires_at)
+
+
+class OutboxEmail(models.Model):
+    """Email queued by a request and delivered later by the send_outbox worker"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+    ]
+    RESET_CODE = 'reset_code'
+    KIND_CHOICES = [
+        ('', 'Message'),
+        (RESET_CODE, 'Reset code'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.EmailField()
+    # Reset-code requests are queued for any address; the worker looks up the
+    # account, generates the code and writes the body (or skips the row)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Serves the worker's poll for messages that are due
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_pending_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to} ({self.status})"
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import OutboxEmail, PasswordResetCode
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 6
+# A claimed message is retried after this long if its worker dies mid-send
+OUTBOX_LEASE = timedelta(minutes=5)
+# Sent and failed messages are kept this long (bodies blanked) before reap_reset_codes deletes them
+OUTBOX_RETENTION = timedelta(days=7)
+
+
+def enqueue_email(subject, body, to, from_email=None, kind=''):
+    """Queue one email for the worker; a single INSERT, no network I/O."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        kind=kind,
+        from_email=from_email or getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@taskio.com'),
+    )
+
+
+def enqueue_reset_code(email):
+    """Queue a password reset code for ``email``, registered or not.
+
+    The request does the same single INSERT for every address; the worker
+    looks the account up and generates the code, so response time does not
+    reveal whether the address has an account.
+    """
+    return enqueue_email('TASK.IO - Your Password Reset Code', '', email, kind=OutboxEmail.RESET_CODE)
+
+
+def reset_code_body(email):
+    """Generate a code for the account using ``email`` and return the email body, or None."""
+    user = PasswordResetCode.account_for(email)
+    if user is None:
+        return None
+    reset_code = PasswordResetCode.generate_code(user)
+    return f'''Hello {user.username},
+
+You requested to reset your password. Use this 6-digit code to verify your identity:
+
+    🔐  {reset_code.code}
+
+This code will expire in 15 minutes.
+
+If you didn't request this, please ignore this email.
+
+Best regards,
+The TASK.IO Team
+'''
+
+
+def build_email(message):
+    """The EmailMessage for an outbox row, or None for a reset request that matches no account."""
+    body = message.body
+    if message.kind == OutboxEmail.RESET_CODE:
+        body = reset_code_body(message.to)
+        if body is None:
+            return None
+    return EmailMessage(message.subject, body, message.from_email, [message.to])
+
+
+def finished_outbox(now=None):
+    """Sent, failed and skipped messages older than OUTBOX_RETENTION."""
+    return OutboxEmail.objects.filter(
+        status__in=['sent', 'failed', 'skipped'], created_at__lt=(now or timezone.now()) - OUTBOX_RETENTION,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 30s, 1m, 2m, 4m, ... capped at one hour."""
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def claim_outbox(now=None, batch_size=OUTBOX_BATCH_SIZE):
+    """Lease up to ``batch_size`` due messages and return them.
+
+    Claiming bumps ``attempts`` and pushes ``next_attempt_at`` out by the
+    lease, so other workers skip these rows and a crashed worker's messages
+    come back on their own once the lease runs out.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(status='pending', next_attempt_at__lte=now).order_by('next_attempt_at')
+        if connections[due.db].features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        messages = list(due[:batch_size])
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + OUTBOX_LEASE
+        OutboxEmail.objects.bulk_update(messages, ['attempts', 'next_attempt_at'])
+    return messages
+
+
+def drain_outbox(now=None, batch_size=OUTBOX_BATCH_SIZE, connection=None):
+    """Deliver due outbox messages over one reused mail connection.
+
+    Messages are sent one at a time so a single bad address does not fail
+    the batch. Failures are rescheduled with backoff and marked failed after
+    OUTBOX_MAX_ATTEMPTS. Once a message is sent or has failed its body is
+    blanked; reset codes are generated here and never stored in the body.
+    Reset requests for unregistered addresses are marked skipped. Returns
+    the number of messages sent.
+    """
+    connection = connection or get_connection()
+    sent = 0
+    with connection:
+        while True:
+            messages = claim_outbox(now, batch_size)
+            if not messages:
+                break
+
+            for message in messages:
+                try:
+                    email = build_email(message)
+                    if email is not None:
+                        connection.send_messages([email])
+                except Exception as e:
+                    message.last_error = str(e)
+                    if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                        message.status = 'failed'
+                        message.body = ''
+                    else:
+                        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+                    # The session may be broken; the backend reopens it on the next send
+                    connection.close()
+                else:
+                    if email is None:
+                        message.status = 'skipped'
+                        continue
+                    message.status = 'sent'
+                    message.sent_at = timezone.now()
+                    message.body = ''
+                    sent += 1
+            OutboxEmail.objects.bulk_update(messages, ['status', 'body', 'sent_at', 'next_attempt_at', 'last_error'])
+
+            if len(messages) < batch_size:
+                break
+    return sent
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Profile
+
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+
+def profile_cache_key(user_id):
+    return f'security_management:profile:{user_id}'
+
+
+def get_profile(user_id):
+    """The user's Profile, read from the per-user cache entry when present."""
+    key = profile_cache_key(user_id)
+    profile = cache.get(key)
+    if profile is None:
+        profile = Profile.objects.filter(user_id=user_id).first()
+        if profile is None:
+            # Profiles are created at registration; this only catches stragglers
+            profile, _ = Profile.objects.get_or_create(user_id=user_id)
+        cache.set(key, profile, PROFILE_CACHE_TIMEOUT)
+    return profile
+
+
+def request_profile(request):
+    """The signed-in user's Profile, loaded at most once per request."""
+    if not hasattr(request, '_cached_profile'):
+        user = request.user
+        request._cached_profile = get_profile(user.pk) if user.is_authenticated else None
+    return request._cached_profile
+
+
+def editable_profile(request):
+    """The signed-in user's Profile read from the database, for views that save it.
+
+    A cached copy can be stale (the picture worker saves from another process)
+    and must never be saved back. The fresh row also serves the rest of the request.
+    """
+    profile, _ = Profile.objects.get_or_create(user=request.user)
+    request._cached_profile = profile
+    return profile
+
+
+def invalidate_profile(user_id):
+    """Drop the cached Profile once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(profile_cache_key(user_id)))
@@ -0,0 +1,147 @@
+"""Attempt limits for login and reset-code verification.
+
+Each limited key passes two checks: a per-process token bucket that absorbs
+bursts without leaving the process, then a sliding-window counter in a
+shared cache (RATELIMIT_CACHE; point it at a DatabaseCache to keep the
+counters in the database). Both run before the view, so a rejected attempt
+never reaches a password hash or a query of the view's own.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.shortcuts import redirect
+
+# Upper bound on token buckets kept per process; the oldest are dropped first
+MAX_BUCKETS = 10_000
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_rate(rate):
+    """'10/5m' -> (10, 300)."""
+    limit, period = rate.split('/')
+    unit = period[-1]
+    return int(limit), int(period[:-1] or 1) * UNITS[unit]
+
+
+def _client_ip(request):
+    """The client address; behind RATELIMIT_PROXY_COUNT proxies, read from X-Forwarded-For.
+
+    Each proxy appends the address it received the request from, so the
+    client is the entry that many places from the right. Entries further
+    left are supplied by the client and are never trusted.
+    """
+    proxies = getattr(settings, 'RATELIMIT_PROXY_COUNT', 0)
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _account(request):
+    return request.POST.get('username_or_email', '').strip().lower()
+
+
+def _reset_email(request):
+    return (request.session.get('reset_email') or '').lower()
+
+
+KEY_FUNCS = {
+    'ip': _client_ip,
+    'account': _account,
+    'email': _reset_email,
+}
+
+
+class TokenBuckets:
+    """In-process token buckets, refilled continuously at limit/period per second."""
+
+    def __init__(self, max_buckets=MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, limit, period, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (limit, now))
+            tokens = min(limit, tokens + (now - updated) * limit / period)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        return allowed
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+_buckets = TokenBuckets()
+
+
+def sliding_window_hit(cache, key, limit, period, now=None):
+    """Count one attempt and return whether the sliding window still allows it.
+
+    Uses the fixed-window pair approximation: the previous window's count is
+    weighted by how much of it still overlaps the sliding window.
+    """
+    now = time.time() if now is None else now
+    window = int(now // period)
+    current_key = f'ratelimit:{key}:{window}'
+    cache.add(current_key, 0, period * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(current_key, 1, period * 2)
+        current = 1
+    previous = cache.get(f'ratelimit:{key}:{window - 1}', 0)
+    overlap = 1 - (now % period) / period
+    return previous * overlap + current <= limit
+
+
+def is_limited(scope, request, rates):
+    cache = caches[getattr(settings, 'RATELIMIT_CACHE', 'default')]
+    for key_name, rate in rates.items():
+        value = KEY_FUNCS[key_name](request)
+        if not value:
+            continue
+        limit, period = parse_rate(rate)
+        key = f'{scope}:{key_name}:{value}'
+        if not _buckets.take(key, limit, period) or not sliding_window_hit(cache, key, limit, period):
+            return True
+    return False
+
+
+def rate_limit(scope, rates, methods=('POST',)):
+    """Limit ``methods`` requests to a view per key, e.g. ``{'ip': '30/5m', 'account': '10/5m'}``.
+
+    Keys come from KEY_FUNCS. Rejected attempts are redirected back to the
+    same page with an error message, like the views' own validation errors.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (request.method in methods and getattr(settings, 'RATELIMIT_ENABLED', True)
+                    and is_limited(scope, request, rates)):
+                messages.error(request, 'Too many attempts. Please wait a few minutes and try again.')
+                response = redirect(request.get_full_path())
+                response['Retry-After'] = str(max(parse_rate(rate)[1] for rate in rates.values()))
+                return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset():
+    """Forget the in-process buckets (the shared counters expire on their own)."""
+    _buckets.clear()
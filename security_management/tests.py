@@ -1,3 +1,332 @@
-from django.test import TestCase
+import io
+import tempfile
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import ratelimit
+from .backends import UsernameOrEmailBackend
+from .images import (
+    MAX_DIMENSION, PICTURE_LEASE, claim_pending_pictures, process_pending_pictures, process_profile_picture,
+)
+from .models import OutboxEmail, PasswordResetCode, Profile
+from .profiles import profile_cache_key
+from .outbox import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETENTION, drain_outbox
+
+
+class FlakyBackend:
+    """Mail connection whose sends always fail."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP unavailable')
+
+
+class ResetCodeOutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('resetme', 'resetme@example.com', 'pass12345')
+
+    def test_request_queues_email_instead_of_sending(self):
+        response = self.client.post(reverse('request_reset_code'), {'email': 'resetme@example.com'})
+        self.assertRedirects(response, reverse('verify_reset_code'))
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(drain_outbox(connection=get_connection()), 1)
+        code = PasswordResetCode.objects.get(user=self.user).code
+        self.assertEqual(mail.outbox[0].to, ['resetme@example.com'])
+        self.assertIn(code, mail.outbox[0].body)
+        # The delivered code does not linger in the database
+        self.assertEqual(OutboxEmail.objects.get().body, '')
+        self.assertEqual(OutboxEmail.objects.get().status, 'sent')
+
+    def test_unknown_email_gets_same_response(self):
+        with CaptureQueriesContext(connection) as known_queries:
+            known = self.client.post(reverse('request_reset_code'), {'email': 'resetme@example.com'})
+        with CaptureQueriesContext(connection) as unknown_queries:
+            unknown = self.client.post(reverse('request_reset_code'), {'email': 'nobody@example.com'})
+        self.assertEqual(unknown.status_code, known.status_code)
+        self.assertEqual(unknown.url, known.url)
+        # The request does the same work either way; the worker tells them apart
+        self.assertEqual(len(unknown_queries), len(known_queries))
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+        self.assertFalse(PasswordResetCode.objects.exists())
+
+        self.assertEqual(drain_outbox(connection=get_connection()), 1)
+        self.assertEqual([m.to for m in mail.outbox], [['resetme@example.com']])
+        self.assertEqual(OutboxEmail.objects.get(to='nobody@example.com').status, 'skipped')
+        self.assertEqual(PasswordResetCode.objects.get().user, self.user)
+
+    def test_shared_email_resets_one_account(self):
+        User.objects.create_user('resetme-too', 'resetme@example.com', 'pass12345')
+        self.client.post(reverse('request_reset_code'), {'email': 'resetme@example.com'})
+        drain_outbox(connection=get_connection())
+        code = PasswordResetCode.objects.get()
+        self.assertEqual(code.user, self.user)
+
+        response = self.client.post(reverse('verify_reset_code'), {'code': code.code})
+        self.assertRedirects(response, reverse('set_new_password'), fetch_redirect_response=False)
+        self.assertEqual(self.client.session['reset_user_id'], self.user.pk)
+
+    def test_failed_sends_back_off_then_give_up(self):
+        self.client.post(reverse('request_reset_code'), {'email': 'resetme@example.com'})
+        message = OutboxEmail.objects.get()
+
+        self.assertEqual(drain_outbox(connection=FlakyBackend()), 0)
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertIn('SMTP unavailable', message.last_error)
+
+        # Not due again until the backoff has passed
+        self.assertEqual(drain_outbox(connection=FlakyBackend()), 0)
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+
+        for _ in range(OUTBOX_MAX_ATTEMPTS - 1):
+            drain_outbox(now=timezone.now() + timezone.timedelta(days=1), connection=FlakyBackend())
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', OUTBOX_MAX_ATTEMPTS))
+        self.assertEqual(message.body, '')
+
+
+class UsernameOrEmailBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('Casey', 'Casey@Example.com', 'pass12345')
+        # Another account whose email equals the first one's username
+        User.objects.create_user('other', 'casey', 'pass12345')
+
+    def test_username_or_email_in_one_query(self):
+        backend = UsernameOrEmailBackend()
+        for login in ('casey', 'CASEY@example.com', ' Casey '):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(backend.authenticate(None, username=login, password='pass12345'), self.user)
+            self.assertEqual(len(queries), 1)
+        self.assertIsNone(backend.authenticate(None, username='casey@example.com', password='wrong'))
+        self.assertIsNone(backend.authenticate(None, username='nobody', password='pass12345'))
+
+    def test_exact_username_wins_over_another_case(self):
+        upper = User.objects.create_user('Bob', 'bob.upper@example.com', 'upper-pass-1')
+        lower = User.objects.create_user('bob', 'bob.lower@example.com', 'lower-pass-1')
+        backend = UsernameOrEmailBackend()
+        self.assertEqual(backend.authenticate(None, username='Bob', password='upper-pass-1'), upper)
+        self.assertEqual(backend.authenticate(None, username='bob', password='lower-pass-1'), lower)
+        self.assertIsNone(backend.authenticate(None, username='bob', password='upper-pass-1'))
+
+    def test_login_view_accepts_email(self):
+        response = self.client.post(reverse('login'), {'username_or_email': 'casey@example.com', 'password': 'pass12345'})
+        self.assertRedirects(response, reverse('organizer_dashboard'), fetch_redirect_response=False)
+
+    def test_old_hashes_are_upgraded_at_login(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password('pass12345', hasher='pbkdf2_sha256'))
+        self.assertEqual(UsernameOrEmailBackend().authenticate(None, username='casey', password='pass12345'), self.user)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2$argon2id$'))
+        self.assertIn('m=19456,t=2,p=1', self.user.password)
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.user = User.objects.create_user('guarded', 'guarded@example.com', 'pass12345')
+
+    def test_token_bucket_refills_over_time(self):
+        buckets = ratelimit.TokenBuckets()
+        self.assertTrue(all(buckets.take('k', 3, 60, now=0) for _ in range(3)))
+        self.assertFalse(buckets.take('k', 3, 60, now=0))
+        self.assertTrue(buckets.take('k', 3, 60, now=20))
+
+    def test_client_ip_is_read_through_trusted_proxies_only(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7')
+        self.assertEqual(ratelimit._client_ip(request), '10.0.0.2')
+        with override_settings(RATELIMIT_PROXY_COUNT=1):
+            self.assertEqual(ratelimit._client_ip(request), '203.0.113.7')
+            self.assertEqual(ratelimit._client_ip(RequestFactory().get('/', REMOTE_ADDR='10.0.0.2')), '10.0.0.2')
+        with override_settings(RATELIMIT_PROXY_COUNT=2):
+            self.assertEqual(ratelimit._client_ip(request), '6.6.6.6')
+
+    def test_login_is_limited_per_account_before_authenticating(self):
+        for _ in range(10):
+            self.client.post(reverse('login'), {'username_or_email': 'guarded', 'password': 'wrong'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('login'), {'username_or_email': 'GUARDED', 'password': 'pass12345'})
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.assertIn('Retry-After', response)
+        self.assertFalse([q for q in queries if 'auth_user' in q['sql']])
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+    def test_reset_code_guesses_are_limited_per_email(self):
+        code = PasswordResetCode.generate_code(self.user).code
+        wrong = '000000' if code != '000000' else '111111'
+        session = self.client.session
+        session['reset_email'] = 'guarded@example.com'
+        session.save()
+        for _ in range(5):
+            response = self.client.post(reverse('verify_reset_code'), {'code': wrong})
+            self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('verify_reset_code'), {'code': code})
+        self.assertRedirects(response, reverse('verify_reset_code'), fetch_redirect_response=False)
+
+
+class ReapResetCodesTests(TestCase):
+    def test_expired_and_used_codes_are_deleted_in_chunks(self):
+        user = User.objects.create_user('reaped', 'reaped@example.com', 'pass12345')
+        past = timezone.now() - timezone.timedelta(minutes=1)
+        future = timezone.now() + timezone.timedelta(minutes=10)
+        PasswordResetCode.objects.bulk_create(
+            [PasswordResetCode(user=user, code='111111', expires_at=past) for _ in range(5)]
+            + [PasswordResetCode(user=user, code='222222', expires_at=future, is_used=True)]
+        )
+        live = PasswordResetCode.objects.create(user=user, code='333333', expires_at=future)
+
+        call_command('reap_reset_codes', batch_size=2, stdout=StringIO())
+        self.assertEqual(list(PasswordResetCode.objects.all()), [live])
+
+    def test_old_finished_outbox_emails_are_deleted(self):
+        old = timezone.now() - OUTBOX_RETENTION - timezone.timedelta(hours=1)
+        emails = OutboxEmail.objects.bulk_create([
+            OutboxEmail(subject=status, body='', to='reaped@example.com', status=status) for status in
+            ('sent', 'failed', 'pending', 'sent')
+        ])
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails[:3]]).update(created_at=old)
+
+        call_command('reap_reset_codes', batch_size=1, stdout=StringIO())
+        # Pending messages are never reaped, and recent ones are kept for a while
+        self.assertEqual(list(OutboxEmail.objects.order_by('pk')), emails[2:])
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_registration_creates_the_profile(self):
+        self.client.post(reverse('register'), {
+            'username': 'newbie', 'email': 'newbie@example.com',
+            'password1': 'Sturdy-pass-42', 'password2': 'Sturdy-pass-42',
+        })
+        self.assertTrue(Profile.objects.filter(user__username='newbie').exists())
+
+    def test_pages_read_the_cached_profile_without_writes(self):
+        user = User.objects.create_user('cached', 'cached@example.com', 'pass12345')
+        Profile.objects.filter(user=user).update(dark_mode=True)
+        self.client.force_login(user)
+
+        self.client.get(reverse('today_view'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('today_view'))
+        self.assertContains(response, 'data-theme="dark"')
+        self.assertFalse([q for q in queries if 'security_management_profile' in q['sql']])
+
+    def test_saving_a_profile_drops_the_cache_entry(self):
+        user = User.objects.create_user('edited', 'edited@example.com', 'pass12345')
+        self.client.force_login(user)
+        self.client.get(reverse('profile'))
+        self.assertIsNotNone(cache.get(profile_cache_key(user.pk)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = Profile.objects.get(user=user)
+            profile.bio = 'Hello'
+            profile.save()
+        self.assertIsNone(cache.get(profile_cache_key(user.pk)))
+
+    def test_editing_never_saves_the_cached_copy(self):
+        user = User.objects.create_user('stale', 'stale@example.com', 'pass12345')
+        self.client.force_login(user)
+        self.client.get(reverse('profile'))
+        # The picture worker finished in another process; this process's cache missed it
+        Profile.objects.filter(user=user).update(
+            profile_picture='profile_pics/new.webp', avatar_small='profile_pics/thumbs/new.webp', picture_status='ready',
+        )
+
+        self.client.post(reverse('profile_edit'), {'username': 'stale', 'email': 'stale@example.com', 'bio': 'Hi'})
+        profile = Profile.objects.get(user=user)
+        self.assertEqual((profile.bio, profile.profile_picture.name, profile.picture_status),
+                         ('Hi', 'profile_pics/new.webp', 'ready'))
+
+
+def jpeg_upload(width, height, name='photo.jpg'):
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees
+    exif[0x010F] = 'Camera Maker'
+    Image.new('RGB', (width, height), 'teal').save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ProfilePictureTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('pictured', 'pictured@example.com', 'pass12345')
+        self.client.force_login(self.user)
+
+    def edit(self, picture):
+        return self.client.post(reverse('profile_edit'), {
+            'username': 'pictured', 'email': 'pictured@example.com', 'profile_picture': picture,
+        })
+
+    def test_upload_is_queued_then_resized_and_thumbnailed(self):
+        self.assertRedirects(self.edit(jpeg_upload(3000, 1500)), reverse('profile'), fetch_redirect_response=False)
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.picture_status, 'pending')
+        self.assertEqual(profile.avatar_small_url, profile.profile_picture.url)
+
+        self.assertEqual(process_pending_pictures(), 1)
+        profile.refresh_from_db()
+        self.assertEqual(profile.picture_status, 'ready')
+        with Image.open(profile.profile_picture) as picture:
+            # EXIF rotation applied, then stripped with the rest of the metadata
+            self.assertEqual(picture.size, (MAX_DIMENSION // 2, MAX_DIMENSION))
+            self.assertNotIn(0x010F, picture.getexif())
+        with Image.open(profile.avatar_small) as small:
+            self.assertEqual(small.size, (96, 96))
+
+    def test_a_newer_upload_wins_over_the_picture_being_processed(self):
+        self.edit(jpeg_upload(400, 300, name='first.jpg'))
+        [claimed] = claim_pending_pictures()
+
+        self.edit(jpeg_upload(400, 300, name='second.jpg'))
+        self.assertFalse(process_profile_picture(claimed))
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.picture_status, 'pending')
+        self.assertIn('second', profile.profile_picture.name)
+        self.assertFalse(profile.avatar_small)
+
+        self.assertEqual(process_pending_pictures(), 1)
+        self.assertEqual(Profile.objects.get(user=self.user).picture_status, 'ready')
+
+    def test_expired_leases_are_claimed_again(self):
+        self.edit(jpeg_upload(400, 300))
+        self.assertEqual(len(claim_pending_pictures()), 1)
+        self.assertEqual(claim_pending_pictures(), [])
+        later = timezone.now() + PICTURE_LEASE + timezone.timedelta(seconds=1)
+        self.assertEqual(len(claim_pending_pictures(now=later)), 1)
+
+    def test_oversized_uploads_are_rejected(self):
+        with patch('security_management.images.MAX_UPLOAD_PIXELS', 100 * 100):
+            response = self.edit(jpeg_upload(200, 200))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('megapixels', response.context['form'].errors['profile_picture'][0])
+        self.assertFalse(Profile.objects.get(user=self.user).profile_picture)
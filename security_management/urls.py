@@ -7,6 +7,9 @@ urlpatterns = [
     path('profile/', views.profile_view, name='profile'),
     path('profile/edit/', views.profile_edit_view, name='profile_edit'),
     path('logout/', views.logout_view, name='logout'),
+    path('password-reset/', views.request_reset_code_view, name='request_reset_code'),
+    path('password-reset/verify/', views.verify_reset_code_view, name='verify_reset_code'),
+    path('password-reset/new/', views.set_new_password_view, name='set_new_password'),
 ]
 
 
@@ -3,24 +3,25 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
-from django.conf import settings
 from .forms import RegisterForm, LoginForm, ProfileEditForm
-from .models import Profile, PasswordResetCode
+from .models import PasswordResetCode
+from .outbox import enqueue_reset_code
+from .profiles import editable_profile, request_profile
+from .ratelimit import rate_limit
 
 def register_view(request):
     if request.method == 'POST':
         form = RegisterForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            # Create profile for the new user
-            Profile.objects.get_or_create(user=user)
+            # The Profile is created by the post_save signal
+            form.save()
             messages.success(request, 'Registration successful! You can now log in.')
             return redirect('login')
     else:
         form = RegisterForm()
     return render(request, 'security_management/pages/register.html', {'form': form})
 
+@rate_limit('login', {'ip': '30/5m', 'account': '10/5m'})
 def login_view(request):
     if request.method == 'POST':
         form = LoginForm(request.POST)
@@ -28,17 +29,9 @@ def login_view(request):
             username_or_email = form.cleaned_data['username_or_email']
             password = form.cleaned_data['password']
             
-            # Try to authenticate with username first
+            # UsernameOrEmailBackend accepts either, with a single password check
             user = authenticate(request, username=username_or_email, password=password)
             
-            # If username authentication fails, try finding user by email
-            if user is None:
-                try:
-                    user_obj = User.objects.get(email=username_or_email)
-                    user = authenticate(request, username=user_obj.username, password=password)
-                except User.DoesNotExist:
-                    pass
-            
             if user is not None:
                 # Check if this is the first login ever (last_login is None until first login)
                 if user.last_login is None:
@@ -56,8 +49,7 @@ def login_view(request):
 
 @login_required
 def profile_view(request):
-    # Get or create profile for current user
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = request_profile(request)
     return render(request, 'security_management/pages/profile.html', {
         'user': request.user,
         'profile': profile
@@ -65,7 +57,7 @@ def profile_view(request):
 
 @login_required
 def profile_edit_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = editable_profile(request)
     
     if request.method == 'POST':
         form = ProfileEditForm(request.POST, request.FILES, instance=profile, user=request.user)
@@ -100,50 +92,19 @@ def request_reset_code_view(request):
             messages.error(request, 'Please enter your email address.')
             return render(request, 'security_management/pages/password_reset_code.html')
         
-        try:
-            user = User.objects.get(email=email)
-            
-            # Generate 6-digit code
-            reset_code = PasswordResetCode.generate_code(user)
-            
-            # Send email with code
-            subject = 'TASK.IO - Your Password Reset Code'
-            message = f'''Hello {user.username},
-
-You requested to reset your password. Use this 6-digit code to verify your identity:
-
-    🔐  {reset_code.code}
-
-This code will expire in 15 minutes.
-
-If you didn't request this, please ignore this email.
-
-Best regards,
-The TASK.IO Team
-'''
-            try:
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@taskio.com',
-                    [email],
-                    fail_silently=False,
-                )
-                # Store email in session for next step
-                request.session['reset_email'] = email
-                messages.success(request, f'A 6-digit code has been sent to {email}')
-                return redirect('verify_reset_code')
-            except Exception as e:
-                messages.error(request, f'Failed to send email. Please try again. Error: {str(e)}')
-                
-        except User.DoesNotExist:
-            # Don't reveal if email exists - show same message
-            messages.success(request, f'If an account exists with this email, a code has been sent.')
-            return redirect('verify_reset_code')
+        # The same single INSERT for every address: the send_outbox worker looks
+        # the account up and generates the code, so timing reveals nothing
+        enqueue_reset_code(email)
+
+        # Same response whether or not the email exists
+        request.session['reset_email'] = email
+        messages.success(request, 'If an account exists with this email, a code has been sent.')
+        return redirect('verify_reset_code')
     
     return render(request, 'security_management/pages/password_reset_code.html')
 
 
+@rate_limit('reset-verify', {'ip': '30/15m', 'email': '5/15m'})
 def verify_reset_code_view(request):
     """Step 2: User enters the 6-digit code they received"""
     email = request.session.get('reset_email')
@@ -159,8 +120,11 @@ def verify_reset_code_view(request):
             messages.error(request, 'Please enter a valid 6-digit code.')
             return render(request, 'security_management/pages/password_reset_verify.html', {'email': email})
         
-        try:
-            user = User.objects.get(email=email)
+        # The same account the worker generated the code for
+        user = PasswordResetCode.account_for(email)
+        if user is None:
+            messages.error(request, 'Invalid code. Please try again.')
+        else:
             reset_code = PasswordResetCode.objects.filter(
                 user=user, 
                 code=code, 
@@ -174,9 +138,6 @@ def verify_reset_code_view(request):
                 return redirect('set_new_password')
             else:
                 messages.error(request, 'Invalid or expired code. Please try again.')
-                
-        except User.DoesNotExist:
-            messages.error(request, 'Invalid code. Please try again.')
     
     return render(request, 'security_management/pages/password_reset_verify.html', {'email': email})
 
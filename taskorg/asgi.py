@@ -12,5 +12,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskorg.settings')
+# Read by taskorg.db_profiles: persistent connections leak under ASGI
+os.environ['DJANGO_SERVER_INTERFACE'] = 'asgi'
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.TEMPLATE_WARMUP:
+    from organizer.warmup import warm_templates  # noqa: E402
+
+    warm_templates()
@@ -0,0 +1,83 @@
+"""Database settings for each DATABASE_PROFILE, read from the environment.
+
+Kept out of settings.py so benchmark_db_writes can build the same
+configurations against scratch databases.
+"""
+import os
+from importlib.util import find_spec
+
+# Seconds a worker keeps its connection between requests (0 reconnects every request)
+DEFAULT_CONN_MAX_AGE = 600
+
+# 128 MiB of the database file memory-mapped for reads
+SQLITE_MMAP_SIZE = 128 * 1024 * 1024
+# Seconds a writer waits for the lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = 20
+
+
+def _conn_max_age():
+    """CONN_MAX_AGE, defaulting to persistent connections under WSGI only.
+
+    Under ASGI every request runs its sync database work on a thread of its
+    own, and that thread's connection is not closed at request_finished
+    because it is not "old": persistent connections would leak one per
+    request. asgi.py sets DJANGO_SERVER_INTERFACE so the default there is 0;
+    reuse under ASGI comes from the psycopg pool instead.
+    """
+    default = 0 if os.getenv('DJANGO_SERVER_INTERFACE') == 'asgi' else DEFAULT_CONN_MAX_AGE
+    return int(os.getenv('CONN_MAX_AGE', default))
+
+
+def sqlite_database(name):
+    """SQLite tuned for several worker processes writing to one file."""
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': _conn_max_age(),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            # Take the write lock when a transaction begins; a deferred transaction
+            # that later tries to write fails at once instead of waiting its turn
+            'transaction_mode': 'IMMEDIATE',
+            # WAL lets readers run alongside the single writer, and NORMAL only
+            # fsyncs at checkpoints, which WAL keeps safe against corruption
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f'PRAGMA mmap_size={SQLITE_MMAP_SIZE};'
+                f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000};'
+            ),
+        },
+    }
+
+
+def postgres_database():
+    """PostgreSQL from the POSTGRES_* variables.
+
+    Django's connection pool needs psycopg 3 with psycopg_pool; it is used
+    when installed (or forced with POSTGRES_POOL). With psycopg2 each worker
+    keeps one persistent connection instead; set POSTGRES_PGBOUNCER when a
+    transaction-mode PgBouncer sits in front to share them.
+    """
+    pool = os.getenv('POSTGRES_POOL', str(find_spec('psycopg_pool') is not None)).lower() in ('1', 'true', 'yes')
+    options = {}
+    if pool:
+        options['pool'] = {
+            'min_size': int(os.getenv('POSTGRES_POOL_MIN', '2')),
+            'max_size': int(os.getenv('POSTGRES_POOL_MAX', '10')),
+            'timeout': 10,
+        }
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('POSTGRES_DB', 'taskorg'),
+        'USER': os.getenv('POSTGRES_USER', 'taskorg'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+        'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        # Pooled connections go back to the pool, so they must not also be persistent
+        'CONN_MAX_AGE': 0 if pool else _conn_max_age(),
+        'CONN_HEALTH_CHECKS': not pool,
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('POSTGRES_PGBOUNCER', '').lower() in ('1', 'true', 'yes'),
+        'OPTIONS': options,
+    }
@@ -10,20 +10,39 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .db_profiles import postgres_database, sqlite_database
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from .env (see .env.example) before any setting
+# below reads them; variables already set in the environment take precedence.
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    pass
+else:
+    env_path = BASE_DIR / '.env'
+    if env_path.exists():
+        load_dotenv(env_path)
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
+# Settings profile: DJANGO_ENV=production switches DEBUG off and turns on the
+# production-only behaviour below (template warm-up, static manifest, ...).
+DJANGO_ENV = os.getenv('DJANGO_ENV', 'development')
+PRODUCTION = DJANGO_ENV == 'production'
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-=m@k(91^uor8ydg(w1yn8ti^dnhwx4%ns-1&(ph!!gkn$0%0h@'
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'django-insecure-=m@k(91^uor8ydg(w1yn8ti^dnhwx4%ns-1&(ph!!gkn$0%0h@')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DJANGO_DEBUG', str(not PRODUCTION)).lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = ['*']
 
@@ -43,6 +62,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'organizer.assets.StaticAssetMiddleware',
+    'organizer.querybudget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,14 +76,24 @@ ROOT_URLCONF = 'taskorg.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django templates, timed for the query budget middleware
+        'BACKEND': 'organizer.querybudget.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'organizer' / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'security_management.context_processors.profile',
+            ],
+            # Compiled templates are kept for the life of the process; runserver's
+            # autoreloader clears them when a template changes. TEMPLATE_WARMUP
+            # compiles them all at startup (organizer.warmup).
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -70,18 +101,29 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'taskorg.wsgi.application'
 
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', str(PRODUCTION)).lower() in ('1', 'true', 'yes')
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
+# DATABASE_PROFILE=sqlite (default; SQLITE_PATH) or postgres (POSTGRES_*
+# variables). Under WSGI both keep connections open for CONN_MAX_AGE seconds.
+# Under ASGI (taskorg.asgi) CONN_MAX_AGE defaults to 0, because each request's
+# sync database work runs on its own thread and persistent connections would
+# leak; use Postgres with psycopg_pool there to reuse connections. See
+# taskorg.db_profiles for the tuning and benchmark_db_writes to compare them.
+
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'sqlite')
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': (postgres_database() if DATABASE_PROFILE == 'postgres'
+                else sqlite_database(os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'))),
 }
 
 
+# Log in with a username or an email address, resolved in one indexed query
+AUTHENTICATION_BACKENDS = ['security_management.backends.UsernameOrEmailBackend']
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -119,6 +161,20 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Hashed, minified and precompressed static files (organizer.assets); when
+# enabled, StaticAssetMiddleware serves them with far-future cache headers.
+# Off by default while DEBUG is on, so runserver serves the sources as-is.
+STATIC_MANIFEST = os.getenv('STATIC_MANIFEST', str(not DEBUG)).lower() in ('1', 'true', 'yes')
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': ('organizer.assets.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+                    else 'django.contrib.staticfiles.storage.StaticFilesStorage'),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -144,25 +200,62 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 PASSWORD_RESET_TIMEOUT = 3600  # 1 hour
 
-# Load environment variables for email (if .env file exists)
-import os
-from pathlib import Path
+# If Gmail credentials are set (e.g. in .env), use Gmail SMTP
+if os.getenv('EMAIL_HOST_USER') and os.getenv('EMAIL_HOST_PASSWORD'):
+    if os.getenv('EMAIL_HOST_USER') != 'your-email@gmail.com':
+        EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        EMAIL_HOST = 'smtp.gmail.com'
+        EMAIL_PORT = 587
+        EMAIL_USE_TLS = True
+        EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
+        EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+        DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER')
+
+# Cache (per-user dashboard fragments, profiles, rate-limit counters)
+# All worker processes must share it: writes invalidate a user's dashboard by
+# bumping a version key, and a local-memory cache only bumps it in the worker
+# that handled the write, so the other workers keep serving the old page for up
+# to DASHBOARD_CACHE_TIMEOUT. Local memory is therefore only the development
+# default (a single runserver process); production defaults to a file-based
+# cache in CACHE_LOCATION. Point CACHE_BACKEND at Redis or Memcached instead if
+# one is available.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache' if PRODUCTION
+                             else 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache') if PRODUCTION else 'taskorg'),
+    }
+}
 
-# Try to load dotenv
-try:
-    from dotenv import load_dotenv
-    env_path = BASE_DIR / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-        # If credentials are set, use Gmail SMTP
-        if os.getenv('EMAIL_HOST_USER') and os.getenv('EMAIL_HOST_PASSWORD'):
-            if os.getenv('EMAIL_HOST_USER') != 'your-email@gmail.com':
-                EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-                EMAIL_HOST = 'smtp.gmail.com'
-                EMAIL_PORT = 587
-                EMAIL_USE_TLS = True
-                EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
-                EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
-                DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER')
-except ImportError:
-    pass
\ No newline at end of file
+# Query budget instrumentation (organizer.querybudget)
+# Records per-view query counts, SQL time, repeated queries and render time;
+# read it at /organizer/debug/queries/ (staff only) or via query_budget_report.
+QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', str(DEBUG)).lower() in ('1', 'true', 'yes')
+QUERY_BUDGET_SERVER_TIMING = os.getenv('QUERY_BUDGET_SERVER_TIMING', '').lower() in ('1', 'true', 'yes')
+QUERY_BUDGET_MAX_QUERIES = int(os.getenv('QUERY_BUDGET_MAX_QUERIES', '20'))
+
+# Password hashing (security_management.hashers)
+# Argon2id with tunable costs; the other hashers only verify older hashes,
+# which are upgraded to Argon2 on the user's next login.
+PASSWORD_HASHERS = [
+    'security_management.hashers.ProfiledArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# interactive | moderate | sensitive, or exact costs from `manage.py calibrate_argon2`
+ARGON2_PROFILE = os.getenv('ARGON2_PROFILE', 'interactive')
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '0')) or None
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '0')) or None  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '0')) or None
+
+# Attempt limits on login and reset-code verification (security_management.ratelimit)
+# Counters live in this cache alias; use a shared backend (or a DatabaseCache)
+# when running several worker processes.
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RATELIMIT_CACHE = 'default'
+# Reverse proxies in front of the app (load balancer, nginx, ...). Per-IP limits
+# then key on the client address from X-Forwarded-For instead of REMOTE_ADDR,
+# which would be the proxy's and put every client in one bucket.
+RATELIMIT_PROXY_COUNT = int(os.getenv('RATELIMIT_PROXY_COUNT', '0'))